@@ -0,0 +1,288 @@
+# benchmarks/bench_camada_fisica.py
+"""
+Benchmarks da camada física.
+
+Uso:
+    python3 benchmarks/bench_camada_fisica.py [--spb 4] [--max-bits 10000000]
+
+--spb vale para as seções de banda base e de vazão; as que comparam BER
+com portadora usam SPB_PORTADORA (fs acima de Nyquist para fc e os tons do FSK).
+
+Mede o tempo dos moduladores ASK e FSK para tamanhos crescentes de mensagem
+e mostra o custo por bit, que deve ficar aproximadamente constante
+(escalonamento linear). Também mede a vazão de recepção dos decodificadores
+em amostras por segundo e compara quadros processados um a um com o mesmo
+conjunto processado como lote (matriz n_quadros x n_bits). Por fim mostra o
+pico de memória do modo streaming, que não depende do tamanho da mensagem,
+e compara float64/float32/float16 em memória, tempo e BER. A última seção
+compara o custo do ruído numa varredura de SNR: uma chamada de add_awgn por
+SNR, o pool de ruído pré-gerado e add_awgn_snrs.
+O modo de nível de símbolo (canal_simbolos) é comparado com o caminho por
+amostras: a BER tem que ser a mesma (os intervalos de confiança se cruzam,
+senão a seção falha com AssertionError) em muito menos tempo. O caminho por
+amostras é dominado pelos samples_per_bit sorteios de ruído por bit; o de
+símbolo sorteia k por símbolo, então a aceleração cresce com samples_per_bit
+(20-40x a 50 amostras/bit, ~500x a 500 para NRZ e 16-QAM). ASK e FSK ficam
+abaixo, ~20x e ~10x a 50 amostras/bit: o ASK sorteia também a energia do
+ruído fora da portadora (qui-quadrado, que custa ~2 normais); o FSK sorteia
+k = 4 correlações (sen/cos de cada tom) por bit, mais o produto 4x4 que as
+correlaciona, e com BER ~2% os erros chegam em um ou dois lotes, então os
+custos fixos por lote pesam também no caminho por amostras.
+O decodificador M-FSK (banco de bins da DFT) é medido para M = 2..16: o
+custo cresce com M dentro de uma única multiplicação de matrizes.
+A decodificação paralela (decodifica_paralelo) é medida de 1 thread até o
+número de núcleos da máquina.
+O modo de envelope complexo (modula_iq/add_awgn_iq/demodula_iq) é comparado
+com a banda passante em amostras, memória, tempo e BER.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(ROOT))
+
+from camada_fisica.CamadaFisica import CamadaFisica
+from camada_fisica.SimuladorBER import SimuladorBER
+
+# Seções com portadora (ASK/FSK/QPSK/16-QAM) rodam com esta taxa qualquer
+# que seja --spb: com fs = 4 Hz a portadora do ASK (fc = 10 Hz) e o tom de
+# 2 Hz do FSK ficam em cima ou acima de Nyquist e a comparação não vale nada.
+SPB_PORTADORA = 50
+
+
+def _cronometra(fn, *args, repeticoes=3):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        ini = time.perf_counter()
+        fn(*args)
+        melhor = min(melhor, time.perf_counter() - ini)
+    return melhor
+
+
+def _checa_portadoras(cf):
+    fmax = max(cf.fc, cf.f1_fsk, cf.f2_fsk)
+    assert cf.fs > 2 * fmax, f"fs = {cf.fs:g} Hz não amostra portadoras de até {fmax:g} Hz"
+
+
+def bench_moduladores(spb, max_bits):
+    cf = CamadaFisica(samples_per_bit=spb)
+    rng = np.random.default_rng(0)
+
+    print(f"== Moduladores ASK/FSK (samples/bit = {spb}) ==")
+    print(f"{'bits':>10} {'metodo':>6} {'tempo (s)':>10} {'ns/bit':>8}")
+    n = 1000
+    while n <= max_bits:
+        bits = rng.integers(0, 2, n)
+        for nome in ("ask", "fsk"):
+            dt = _cronometra(getattr(cf, nome), bits)
+            print(f"{n:>10} {nome:>6} {dt:>10.4f} {dt / n * 1e9:>8.1f}")
+        n *= 10
+
+
+def bench_decodificadores(spb, n_bits):
+    cf = CamadaFisica(samples_per_bit=spb)
+    rng = np.random.default_rng(0)
+    bits = rng.integers(0, 2, n_bits)
+
+    pares = [
+        ("nrz_polar", "decode_nrz_polar"),
+        ("manchester", "decode_manchester"),
+        ("bipolar_ami", "decode_bipolar_ami"),
+        ("ask", "decode_ask"),
+        ("fsk", "decode_fsk"),
+        ("qpsk", "decode_qpsk"),
+        ("st_qam", "decode_st_qam"),
+    ]
+    print(f"== Decodificadores ({n_bits} bits, samples/bit = {spb}) ==")
+    print(f"{'decodificador':>20} {'tempo (s)':>10} {'Mamostras/s':>12}")
+    for mod, dec in pares:
+        _, w = getattr(cf, mod)(bits)
+        dt = _cronometra(getattr(cf, dec), w)
+        print(f"{dec:>20} {dt:>10.4f} {len(w) / dt / 1e6:>12.1f}")
+
+
+def bench_lote(spb, n_quadros=2000, n_bits=128):
+    cf = CamadaFisica(samples_per_bit=spb)
+    rng = np.random.default_rng(0)
+    quadros = rng.integers(0, 2, (n_quadros, n_bits))
+
+    def um_a_um():
+        for q in quadros:
+            _, w = cf.qpsk(q)
+            cf.decode_qpsk(cf.add_awgn(w, 10.0))
+
+    def em_lote():
+        _, w = cf.qpsk(quadros)
+        cf.decode_qpsk(cf.add_awgn(w, 10.0))
+
+    print(f"== Lote QPSK ({n_quadros} quadros de {n_bits} bits) ==")
+    t_serial = _cronometra(um_a_um, repeticoes=1)
+    t_lote = _cronometra(em_lote)
+    print(f"um a um: {t_serial:.4f} s   lote: {t_lote:.4f} s   ({t_serial / t_lote:.1f}x)")
+
+
+def bench_stream(spb, bloco_bits=65536):
+    cf = CamadaFisica(samples_per_bit=spb)
+    rng = np.random.default_rng(0)
+
+    def blocos(n_bits):
+        for ini in range(0, n_bits, bloco_bits):
+            yield rng.integers(0, 2, min(bloco_bits, n_bits - ini), dtype=np.uint8)
+
+    print(f"== Streaming FSK (blocos de {bloco_bits} bits) ==")
+    print(f"{'bits':>10} {'pico (MB)':>10}")
+    for n_bits in (10 ** 5, 10 ** 6, 10 ** 7):
+        tracemalloc.start()
+        for bits in cf.demodula_stream("FSK", cf.modula_stream("FSK", blocos(n_bits))):
+            pass
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{n_bits:>10} {pico / 2 ** 20:>10.1f}")
+
+
+def bench_dtype(spb=SPB_PORTADORA, n_bits=200_000):
+    rng = np.random.default_rng(0)
+    bits = rng.integers(0, 2, n_bits)
+
+    print(f"== dtype das amostras (FSK, {n_bits} bits, samples/bit = {spb}) ==")
+    print(f"{'dtype':>8} {'MB':>8} {'tx+rx (s)':>10} {'BER @ -8 dB':>11}")
+    for dtype in (np.float64, np.float32, np.float16):
+        cf = CamadaFisica(samples_per_bit=spb, dtype=dtype)
+        _checa_portadoras(cf)
+
+        def tx_rx():
+            _, w = cf.fsk(bits)
+            return cf.decode_fsk(cf.add_awgn(w, -8.0))
+
+        _, w = cf.fsk(bits)
+        dt = _cronometra(tx_rx)
+        ber = SimuladorBER(cf, seed=1).ponto("FSK", -8.0, erros_alvo=2000)["ber"]
+        print(f"{np.dtype(dtype).name:>8} {w.nbytes / 2 ** 20:>8.1f} {dt:>10.4f} {ber:>11.5f}")
+
+
+def bench_ruido(spb, n_bits=100_000, snrs_db=tuple(range(-10, 21, 2))):
+    cf = CamadaFisica(samples_per_bit=spb, seed=0)
+    _, w = cf.fsk(np.random.default_rng(0).integers(0, 2, n_bits))
+    pot = cf.potencia(w)
+
+    def por_snr():
+        for snr in snrs_db:
+            cf.add_awgn(w, snr)
+
+    def por_snr_pool():
+        for snr in snrs_db:
+            cf.add_awgn(w, snr, potencia=pot)
+
+    print(f"== Ruído em {len(snrs_db)} SNRs (FSK, {len(w)} amostras) ==")
+    t_serial = _cronometra(por_snr)
+    cf.ruido.criar_pool(4 * len(w))
+    t_pool = _cronometra(por_snr_pool)
+    cf.ruido.descartar_pool()
+    t_multi = _cronometra(cf.add_awgn_snrs, w, snrs_db)
+    print(f"add_awgn por SNR: {t_serial:.4f} s   com pool: {t_pool:.4f} s   "
+          f"add_awgn_snrs: {t_multi:.4f} s")
+
+
+def bench_simbolo(spb=50, erros_alvo=2000):
+    cf = CamadaFisica(samples_per_bit=spb, seed=0)
+    casos = [("NRZ-Polar", -8.0), ("Manchester", -8.0), ("Bipolar (AMI)", -3.0), ("ASK", 3.0),
+             ("FSK", -6.0), ("QPSK", -8.0), ("16-QAM", -3.0)]
+
+    print(f"== Nível de amostra x nível de símbolo (samples/bit = {spb}, {erros_alvo} erros) ==")
+    print(f"{'modulacao':>14} {'BER amostra':>22} {'BER simbolo':>22} {'acelera':>8} {'IC':>3}")
+    divergentes = []
+    for mod, snr in casos:
+        res = {}
+        for nivel in ("amostra", "simbolo"):
+            sim = SimuladorBER(cf, seed=1, nivel=nivel)
+            ini = time.perf_counter()
+            res[nivel] = sim.ponto(mod, snr, erros_alvo=erros_alvo)
+            res[nivel]["tempo"] = time.perf_counter() - ini
+        a, s = res["amostra"], res["simbolo"]
+        ok = a["ber_inf"] <= s["ber_sup"] and s["ber_inf"] <= a["ber_sup"]
+        print(f"{mod:>14} {a['ber']:>8.5f} ({a['tempo']:>7.3f} s) {s['ber']:>8.5f} ({s['tempo']:>7.3f} s)"
+              f" {a['tempo'] / s['tempo']:>7.0f}x {'ok' if ok else '!!':>3}")
+        if not ok:
+            divergentes.append(mod)
+    assert not divergentes, f"BER por símbolo fora do intervalo da BER por amostras: {', '.join(divergentes)}"
+
+
+def bench_mfsk(n_bits=240_000, spb=50):
+    cf = CamadaFisica(samples_per_bit=spb)
+    bits = np.random.default_rng(0).integers(0, 2, n_bits)
+
+    print(f"== Decodificador M-FSK ({n_bits} bits, samples/bit = {spb}) ==")
+    print(f"{'M':>4} {'tempo (s)':>10} {'Mamostras/s':>12}")
+    for M in (2, 4, 8, 16):
+        _, w = cf.mfsk(bits, M=M)
+        dt = _cronometra(cf.decode_mfsk, w, M)
+        print(f"{M:>4} {dt:>10.4f} {len(w) / dt / 1e6:>12.1f}")
+
+
+def bench_paralelo(spb=SPB_PORTADORA, n_bits=400_000):
+    cf = CamadaFisica(samples_per_bit=spb)
+    _checa_portadoras(cf)
+    _, w = cf.fsk(np.random.default_rng(0).integers(0, 2, n_bits))
+    serial = _cronometra(cf.decode_fsk, w)
+
+    print(f"== Decodificação paralela FSK ({len(w) / 1e6:.0f} Mamostras) ==")
+    print(f"{'threads':>8} {'tempo (s)':>10} {'acelera':>8}")
+    print(f"{'serial':>8} {serial:>10.4f} {1.0:>7.1f}x")
+    n = 1
+    while n <= (os.cpu_count() or 1):
+        dt = _cronometra(cf.decodifica_paralelo, "FSK", w, n)
+        print(f"{n:>8} {dt:>10.4f} {serial / dt:>7.1f}x")
+        n *= 2
+
+
+def bench_iq(spb=SPB_PORTADORA, n_bits=400_000):
+    cf = CamadaFisica(samples_per_bit=spb, dtype=np.float32, seed=0)
+    _checa_portadoras(cf)
+    bits = np.random.default_rng(0).integers(0, 2, n_bits)
+    casos = [("ASK", 5.0), ("FSK", -8.0), ("QPSK", -8.0), ("16-QAM", -3.0)]
+
+    print(f"== Banda passante x envelope I/Q ({n_bits} bits, samples/bit = {spb}, float32) ==")
+    print(f"{'modulacao':>10} {'MB real':>8} {'MB I/Q':>8} {'tempo real':>11} {'tempo I/Q':>10} {'BER real':>9} {'BER I/Q':>8}")
+    for mod, snr in casos:
+        modular, demodular, _ = cf.par_modulacao(mod)
+
+        def real():
+            return demodular(cf.add_awgn(modular(bits)[1], snr))
+
+        def iq():
+            return cf.demodula_iq(mod, cf.add_awgn_iq(cf.modula_iq(mod, bits)[1], snr, mod))
+
+        mb_real = modular(bits)[1].nbytes / 2 ** 20
+        mb_iq = cf.modula_iq(mod, bits)[1].nbytes / 2 ** 20
+        t_real, t_iq = _cronometra(real), _cronometra(iq)
+        ber_real = np.mean(real()[:n_bits] != bits)
+        ber_iq = np.mean(iq()[:n_bits] != bits)
+        print(f"{mod:>10} {mb_real:>8.1f} {mb_iq:>8.1f} {t_real:>11.4f} {t_iq:>10.4f} {ber_real:>9.5f} {ber_iq:>8.5f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--spb", type=int, default=4, help="amostras por bit")
+    parser.add_argument("--max-bits", type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    bench_moduladores(args.spb, args.max_bits)
+    bench_decodificadores(args.spb, min(args.max_bits, 1_000_000))
+    bench_lote(args.spb)
+    bench_stream(args.spb)
+    bench_dtype()
+    bench_ruido(args.spb)
+    bench_simbolo()
+    bench_mfsk()
+    bench_paralelo()
+    bench_iq()
+
+
+if __name__ == "__main__":
+    main()
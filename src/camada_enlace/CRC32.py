@@ -0,0 +1,91 @@
+import zlib
+
+import numpy as np
+
+from comum.BufferBits import bits_de_bytes, como_bits, como_bytes
+
+
+# G(x) = x³² + x²⁶ + x²³ + x²² + x¹⁶ + x¹² + x¹¹ + x¹⁰ + x⁸ + x⁷ + x⁵ + x⁴ + x² + x + 1
+# (0x104C11DB7; o termo x³² fica implícito no registrador de 32 bits)
+POLINOMIO = 0x04C11DB7
+_MASCARA = 0xFFFFFFFF
+
+
+# zlib.crc32 usa o mesmo G(x), mas com os bits refletidos (LSB primeiro) e o
+# registrador complementado na entrada e na saída. Invertendo os bits de
+# cada byte e do registrador, o laço por byte roda em C.
+_REVERTE_BYTE = bytes(int(f"{i:08b}"[::-1], 2) for i in range(256))
+
+
+def _reflete32(x):
+    return int(f"{x:032b}"[::-1], 2)
+
+
+class CRC32:
+    """
+    CRC-32 (G(x) acima) incremental, com registrador inicial 0 e sem XOR
+    final: o resultado é o resto de M(x) · x³² dividido por G(x), o mesmo da
+    divisão polinomial bit a bit de CamadaEnlace.
+
+    Bytes são processados pelo zlib.crc32, com os bits refletidos.
+    Bits soltos (quadros que não são múltiplos de 8 bits) ficam guardados
+    até completar um byte; os que sobram no fim entram bit a bit no valor.
+
+        crc = CRC32()
+        crc.update(b"...")         # bytes
+        crc.update_bits(bits)      # bits (lista, array ou BufferBits)
+        crc.digest()               # 4 bytes, MSB primeiro
+    """
+
+    def __init__(self, dados=b""):
+        self.crc = 0
+        self._pendentes = np.zeros(0, dtype=np.uint8)
+        if len(dados):
+            self.update(dados)
+
+    def update(self, dados):
+        """Acrescenta bytes (bytes, bytearray, memoryview ou array de inteiros 0..255)."""
+        if len(self._pendentes):
+            self.update_bits(bits_de_bytes(dados))
+            return self
+        dados = como_bytes(dados)
+        if not dados:
+            return self
+        registrador = zlib.crc32(dados.translate(_REVERTE_BYTE), _reflete32(self.crc) ^ _MASCARA)
+        self.crc = _reflete32(registrador ^ _MASCARA)
+        return self
+
+    def update_bits(self, bits):
+        """Acrescenta bits em qualquer quantidade (não precisa ser múltiplo de 8)."""
+        b = como_bits(bits).reshape(-1)
+        if len(self._pendentes):
+            b = np.concatenate([self._pendentes, b])
+        n = len(b) // 8 * 8
+        self._pendentes = np.zeros(0, dtype=np.uint8)
+        self.update(np.packbits(b[:n]).tobytes())
+        self._pendentes = b[n:].copy()
+        return self
+
+    @property
+    def valor(self):
+        """CRC (inteiro de 32 bits) de tudo o que foi acrescentado até agora."""
+        crc = self.crc
+        for bit in self._pendentes.tolist():
+            topo = (crc >> 31) ^ bit
+            crc = (crc << 1) & _MASCARA
+            if topo:
+                crc ^= POLINOMIO
+        return crc
+
+    def digest(self):
+        return self.valor.to_bytes(4, "big")
+
+    def digest_bits(self):
+        """Os 32 bits do CRC (np.uint8, MSB primeiro), como anexados ao quadro."""
+        return bits_de_bytes(self.digest())
+
+    def copy(self):
+        outro = CRC32()
+        outro.crc = self.crc
+        outro._pendentes = self._pendentes.copy()
+        return outro
@@ -1,22 +1,24 @@
+import numpy as np
+
+from camada_enlace import ContagemCaracteres, FlagBytes
+from camada_enlace.CRC32 import CRC32
+from camada_enlace.Checksum16 import Checksum16
+from camada_enlace.FlagBits import FLAG, DesenquadradorFlagBits, insere_stuffing, remove_stuffing
+from comum.BufferBits import como_bits, bits_de_bytes, bytes_de_bits
+
+
 class CamadaEnlace:
+    """
+    Os bits de entrada podem ser listas, arrays ou BufferBits; os bits de
+    saída são sempre arrays np.uint8 (um bit por elemento, MSB primeiro).
+    """
+
     def _bits_to_bytes(self, bits):
-        # Converte array de bits para lista de inteiros (bytes)
-        pad = (-len(bits)) % 8
-        bits = bits + [0] * pad
-        out = []
-        for i in range(0, len(bits), 8):
-            byte = 0
-            for j in range(8):
-                byte = (byte << 1) | bits[i + j]
-            out.append(byte)
-        return out
+        # Converte array de bits para array de bytes (np.uint8)
+        return bytes_de_bits(bits)
 
     def _bytes_to_bits(self, bytes_list):
-        bits = []
-        for b in bytes_list:
-            for i in range(8):
-                bits.append((b >> (7 - i)) & 1)
-        return bits
+        return bits_de_bytes(bytes_list)
 
     # -------------------------------------
     # 1.3 Protocolos de Enquadramento de Dados
@@ -24,130 +26,93 @@ class CamadaEnlace:
 
     # --- 1. Contagem de Caracteres ---
     def enquadramento_contagem_caracteres(self, bits_dados):
-        # Adiciona 1 byte de cabeçalho indicando o tamanho total (header + payload)
+        # Cada quadro tem 1 byte de cabeçalho indicando o tamanho total (header + payload);
+        # payloads maiores que o limite de 1 byte são divididos em vários quadros
+        tamanho_max_payload = ContagemCaracteres.MAX_PAYLOAD  # 254 + cabeçalho = 255
         bytes_dados = self._bits_to_bytes(bits_dados)
-        quadro = []
-        tamanho_max_payload = 255  # Limite de 1 byte
-
-        # Cabeçalho indica o número de bytes no quadro (incluindo ele mesmo)
-        count = len(bytes_dados) + 1
-        quadro.append(count)
-        quadro.extend(bytes_dados)
-
-        return self._bytes_to_bits(quadro)
+        return self._bytes_to_bits(ContagemCaracteres.enquadra(bytes_dados, tamanho_max_payload))
 
     def desenquadramento_contagem_caracteres(self, bits_quadro):
-        bytes_quadro = self._bits_to_bytes(bits_quadro)
-        if not bytes_quadro:
-            return []
+        bytes_quadro = self._bits_to_bytes(bits_quadro).tobytes()
+        if len(bytes_quadro) == 0:
+            return np.zeros(0, dtype=np.uint8)
+
+        # Salta de contagem em contagem e junta os payloads (sem os cabeçalhos)
+        return self._bytes_to_bits(ContagemCaracteres.payload(bytes_quadro))
 
-        # Lê o primeiro byte para saber o tamanho
-        count = bytes_quadro[0]
-        # Retorna apenas o payload (remove o count)
-        return self._bytes_to_bits(bytes_quadro[1:count])
+    def desenquadrador_contagem_caracteres(self):
+        """
+        Desenquadrador com estado para um fluxo contínuo de bytes:
+        feed(bytes) retorna os payloads (bytes) dos quadros completos.
+        """
+        return ContagemCaracteres.DesenquadradorContagem()
 
     # --- 2. Byte Stuffing (Inserção de Bytes) ---
+    # FLAG = 0x7E ('~'), ESC = 0x7D ('}'); o trabalho é feito sobre bytes em FlagBytes
     def enquadramento_flag_bytes(self, bits_dados):
-        FLAG = 0x7E  # '~'
-        ESC = 0x7D  # '}'
-
-        bytes_dados = self._bits_to_bytes(bits_dados)
-        quadro = [FLAG]
-
-        for b in bytes_dados:
-            if b == FLAG or b == ESC:
-                quadro.append(ESC)
-                quadro.append(b)
-            else:
-                quadro.append(b)
-
-        quadro.append(FLAG)
-        return self._bytes_to_bits(quadro)
+        return self._bytes_to_bits(FlagBytes.enquadra(self._bits_to_bytes(bits_dados)))
 
     def desenquadramento_flag_bytes(self, bits_quadro):
-        FLAG = 0x7E
-        ESC = 0x7D
+        # Remove as FLAGs (primeiro e último byte) e os ESC
         bytes_quadro = self._bits_to_bytes(bits_quadro)
-        dados = []
-
-        ignore_next = False
-        payload = bytes_quadro[1:-1]
+        return self._bytes_to_bits(FlagBytes.desescapa(bytes_quadro[1:-1]))
 
-        i = 0
-        while i < len(payload):
-            b = payload[i]
-            if b == ESC:
-                i += 1
-                if i < len(payload):
-                    dados.append(payload[i])
-            else:
-                dados.append(b)
-            i += 1
+    def enquadramento_flag_bytes_fluxo(self, lista_bits_dados):
+        """Vários quadros em um fluxo contínuo, colados pelas FLAGs."""
+        return self._bytes_to_bits(
+            FlagBytes.enquadra_fluxo([self._bits_to_bytes(b) for b in lista_bits_dados])
+        )
 
-        return self._bytes_to_bits(dados)
+    def desenquadrador_flag_bytes(self):
+        """
+        Desenquadrador com estado para um fluxo contínuo de bytes:
+        feed(bytes) retorna os payloads (bytes) dos quadros completos.
+        """
+        return FlagBytes.DesenquadradorFlagBytes()
 
     # --- 3. Bit Stuffing (Inserção de Bits) ---
     def enquadramento_flag_bits(self, bits_dados):
         # Flag: 01111110. Regra: Se aparecerem 5 '1's seguidos nos dados, insere um '0'.
-        saida = []
-        conta_um = 0
-
-        # Adiciona Flag de início
-        flag = [0, 1, 1, 1, 1, 1, 1, 0]
-        saida.extend(flag)
-
-        for b in bits_dados:
-            saida.append(b)
-            if b == 1:
-                conta_um += 1
-                if conta_um == 5:
-                    saida.append(0)  # Stuffing
-                    conta_um = 0
-            else:
-                conta_um = 0
-
-        # Adiciona Flag de fim
-        saida.extend(flag)
-        return saida
+        return np.concatenate([FLAG, insere_stuffing(bits_dados), FLAG])
 
     def desenquadramento_flag_bits(self, bits_quadro):
-        # Remove Flags (assumindo 8 bits no inicio e fim)
-        payload = bits_quadro[8:-8]
-        saida = []
-        conta_um = 0
-
-        i = 0
-        while i < len(payload):
-            b = payload[i]
-            saida.append(b)
-
-            if b == 1:
-                conta_um += 1
-                if conta_um == 5:
-                    # O próximo bit deve ser o '0' de stuffing, pulamos ele
-                    if i + 1 < len(payload) and payload[i + 1] == 0:
-                        i += 1  # Pula o 0 inserido
-                    conta_um = 0
-            else:
-                conta_um = 0
-            i += 1
-
-        return saida
+        # Remove Flags (assumindo 8 bits no inicio e fim) e o '0' depois de cada 5 '1's
+        return remove_stuffing(como_bits(bits_quadro)[8:-8])
+
+    def enquadramento_flag_bits_fluxo(self, lista_bits_dados):
+        """
+        Vários quadros em um fluxo contínuo, colados: a flag de fim de um
+        quadro é a de início do seguinte.
+        """
+        partes = [FLAG]
+        for bits_dados in lista_bits_dados:
+            partes.extend([insere_stuffing(bits_dados), FLAG])
+        return np.concatenate(partes)
+
+    def desenquadrador_flag_bits(self):
+        """
+        Desenquadrador com estado para um fluxo contínuo: feed(bloco)
+        retorna os quadros completos; quadros partidos entre blocos são
+        guardados até a flag seguinte chegar.
+        """
+        return DesenquadradorFlagBits()
 
     # -------------------------------------
     # 1.4 Protocolos de Detecção de Erros
     # -------------------------------------
 
     def encode_paridade(self, bits):
+        bits = como_bits(bits)
         paridade = 0 # Se o somatório for par
-        if sum(bits) % 2 != 0:
+        if int(bits.sum()) % 2 != 0:
             paridade= 1 # Se somatório for ímpar
-        return bits + [paridade] # Adiciona 1 bit de paridade
+        return np.append(bits, np.uint8(paridade)) # Adiciona 1 bit de paridade
 
     def decode_paridade(self, bits):
+        bits = como_bits(bits)
         payload = bits[:-1] # Bits sem o bit de paridade
-        bit_p = bits[-1] # Bit de paridade
-        total_ones = sum(payload) + bit_p # Total de bits 1 + bit de paridade
+        bit_p = int(bits[-1]) # Bit de paridade
+        total_ones = int(payload.sum()) + bit_p # Total de bits 1 + bit de paridade
 
         erro = (total_ones % 2) != 0 # total_ones tem que ser par pra que não haja erro, caso contrário erro = True
         return payload, erro
@@ -156,29 +121,31 @@ class CamadaEnlace:
         """
         Checksum: divide mensagem em bytes, soma, complemento de 1 da soma
         """
+        bits = como_bits(bits)
         bytes_data = self._bits_to_bytes(bits)
         
         # Soma todos os bytes
-        soma = sum(bytes_data) & 0xFF  # Mantém em 8 bits
+        soma = int(bytes_data.sum()) & 0xFF  # Mantém em 8 bits
         
         # Complemento de 1 da soma = checksum
         checksum = (~soma) & 0xFF
         checksum = self._bytes_to_bits([checksum])
         
         # Retorna dados + checksum
-        return bits + checksum
+        return np.concatenate([bits, checksum])
 
     def decode_checksum(self, bits):
         """
         Verifica checksum: soma dados + checksum, complemento de 1 deve ser 0
         """
+        bits = como_bits(bits)
         if len(bits) < 8:
             return bits, True
         
         bytes_data = self._bits_to_bytes(bits)
         
         # Soma todos os bytes (dados + checksum)
-        soma = sum(bytes_data) & 0xFF
+        soma = int(bytes_data.sum()) & 0xFF
         
         # Complemento de 1 da soma deve ser 0
         resultado = (~soma) & 0xFF
@@ -188,30 +155,41 @@ class CamadaEnlace:
         payload = bits[:-8]
         return payload, erro
 
+    def encode_checksum16(self, bits):
+        """
+        Checksum da Internet (RFC 1071): complemento de 1 da soma, em
+        complemento de 1, das palavras de 16 bits; anexa 16 bits ao quadro
+        """
+        bits = como_bits(bits)
+        checksum = Checksum16(self._bits_to_bytes(bits))
+        return np.concatenate([bits, checksum.digest_bits()])
+
+    def decode_checksum16(self, bits):
+        """
+        Recalcula o checksum dos dados e compara com os 16 bits finais
+        (vale também para quadros com número ímpar de bytes); 0x0000 e
+        0xFFFF valem ambos como zero, como em Checksum16.atualiza
+        """
+        bits = como_bits(bits)
+        if len(bits) < 16:
+            return bits, True
+
+        payload = bits[:-16]
+        recebido = int.from_bytes(self._bits_to_bytes(bits[-16:]).tobytes(), "big")
+        erro = not Checksum16.equivalentes(Checksum16(self._bits_to_bytes(payload)).valor, recebido)
+        return payload, erro
+
     def encode_crc(self, bits):
         """
         Polinômio G(x) = x³² + x²⁶ + x²³ + x²² + x¹⁶ + x¹² + x¹¹ + x¹⁰ + x⁸ + x⁷ + x⁵ + x⁴ + x² + x + 1
+        Anexa ao quadro o resto de M(x) · x³² / G(x) (32 bits), calculado
+        por CRC32 (zlib.crc32 sobre os bytes com os bits refletidos).
         """
+        bits = como_bits(bits)
         if len(bits) == 0:
             return bits
-        # Polinômio CRC-32 IEEE 802: 0x104C11DB7
-        # Em binário: 100000100110000010001110110110111 (33 bits)
-        polinomio = 0x104c11db7
-        # Adiciona 32 zeros para a divisão
-        extended_bits = bits + [0] * 32
-        # Divisão polinomial bit a bit
-        divide = extended_bits.copy()
-        for i in range(len(bits)):  # Só processa bits originais
-            if divide[i]:  # Se bit atual é '1'
-                # XOR com polinômio (33 bits)
-                for j in range(33):
-                    if i + j < len(divide):
-                        # Extrai bit j do polinômio (MSB primeiro)
-                        poly_bit = (polinomio >> (32 - j)) & 1
-                        divide[i + j] ^= poly_bit
-        # CRC são os últimos 32 bits (resto da divisão)
-        crc = divide[-32:]
-        return bits + crc  # Dados originais + CRC
+        crc = CRC32().update_bits(bits)
+        return np.concatenate([bits, crc.digest_bits()])  # Dados originais + CRC
 
     def decode_crc(self, bits):
         """
@@ -219,23 +197,12 @@ class CamadaEnlace:
         Se resto = 0 → sem erro
         Se resto ≠ 0 → erro detectado
         """
+        bits = como_bits(bits)
         if len(bits) < 33:  # Mínimo: 1 bit dados + 32 bits CRC
-            return [], True
-
-        polinomio = 0x104c11db7
-        # Divide quadro completo (dados + CRC) por G(x)
-        divide = bits.copy()
-        for i in range(len(bits) - 32):  # Processa até sobrar 32 bits
-            if divide[i] == 1:
-                # XOR com polinômio
-                for j in range(33):
-                    if i + j < len(divide):
-                        poly_bit = (polinomio >> (32 - j)) & 1
-                        divide[i + j] ^= poly_bit
-        # Resto da divisão (últimos 32 bits)
-        resto = divide[-32:]
-        # Se resto ≠ 0, há erro
-        erro = any(bit == 1 for bit in resto)
+            return np.zeros(0, dtype=np.uint8), True
+
+        # Resto da divisão do quadro completo (dados + CRC)
+        erro = CRC32().update_bits(bits).valor != 0
         payload = bits[:-32]  # Remove CRC dos dados
         return payload, erro
 
@@ -243,59 +210,55 @@ class CamadaEnlace:
     # 1.5 Protocolo de Correção de Erros
     # -------------------------------------
 
+    # Ordem dos bits no bloco: [p1, p2, d1, p3, d2, d3, d4]
+    #   p1 = d1 ^ d2 ^ d4 ; p2 = d1 ^ d3 ^ d4 ; p3 = d2 ^ d3 ^ d4
+    # Matriz geradora: bloco = dados (d1..d4) @ G mod 2
+    _HAMMING_G = np.array([
+        [1, 1, 1, 0, 0, 0, 0],
+        [1, 0, 0, 1, 1, 0, 0],
+        [0, 1, 0, 1, 0, 1, 0],
+        [1, 1, 0, 1, 0, 0, 1],
+    ], dtype=np.uint8)
+    # Matriz de verificação com pesos: síndrome = s1 + 2*s2 + 4*s3 = posição do erro (1-7)
+    _HAMMING_H = np.array([
+        [1, 0, 1, 0, 1, 0, 1],
+        [0, 1, 1, 0, 0, 1, 1],
+        [0, 0, 0, 1, 1, 1, 1],
+    ], dtype=np.uint8)
+    _HAMMING_PESOS = np.array([1, 2, 4], dtype=np.uint8)
+    # Síndrome -> padrão de erro a inverter (linha 0: sem erro)
+    _HAMMING_CORRECAO = np.vstack([np.zeros(7, dtype=np.uint8), np.eye(7, dtype=np.uint8)])
+    _HAMMING_DADOS = [2, 4, 5, 6]
+
     def hamming_encode(self, bits):
-       
-        encoded = []
+        """
+        Codifica blocos de 4 bits em 7 (com padding de zeros até múltiplo de 4),
+        todos de uma vez: (n_blocos, 4) @ G mod 2.
+        """
+        bits = como_bits(bits)
 
         # padding para múltiplo de 4
         pad = (-len(bits)) % 4
-        bits = bits + [0] * pad
-
-        for i in range(0, len(bits), 4):
-            d1, d2, d3, d4 = bits[i:i+4]
-
-            # paridades
-            p1 = d1 ^ d2 ^ d4
-            p2 = d1 ^ d3 ^ d4
-            p3 = d2 ^ d3 ^ d4
+        if pad:
+            bits = np.concatenate([bits, np.zeros(pad, dtype=np.uint8)])
 
-            # ordem final (7 bits)
-            block = [p1, p2, d1, p3, d2, d3, d4]
-            encoded.extend(block)
-        return encoded
+        blocos = (bits.reshape(-1, 4) @ self._HAMMING_G) & 1
+        return blocos.reshape(-1)
 
-    
     def hamming_decode(self, bits):
         """
         Decodifica blocos de 7 bits, corrige 1 erro,
-        retorna lista de bits de dados (4 bits por bloco).
+        retorna array de bits de dados (4 bits por bloco).
+        Todas as síndromes saem de um único produto pela matriz H.
         """
-        decoded = []
+        bits = como_bits(bits)
 
         # certifica que temos múltiplo de 7
-        if len(bits) % 7 != 0:
-            bits = bits[: len(bits) - (len(bits) % 7)]
-
-        for i in range(0, len(bits), 7):
-            block = bits[i:i+7]
-            p1, p2, d1, p3, d2, d3, d4 = block
-
-            # calcula sindromes
-            s1 = p1 ^ d1 ^ d2 ^ d4
-            s2 = p2 ^ d1 ^ d3 ^ d4
-            s3 = p3 ^ d2 ^ d3 ^ d4
-
-            # converte síndrome para posição do erro (1-7)
-            error_pos = s1 + (s2 << 1) + (s3 << 2)
-                        
-            # corrige
-            if error_pos != 0:
-                block[error_pos - 1] ^= 1  # inverte bit
-
-                # reatribui
-                p1, p2, d1, p3, d2, d3, d4 = block
-
-            decoded.extend([d1, d2, d3, d4])
-        return decoded
-    
-    
+        blocos = bits[: len(bits) - (len(bits) % 7)].reshape(-1, 7)
+
+        # calcula sindromes e converte para posição do erro (1-7)
+        sindromes = ((blocos @ self._HAMMING_H.T) & 1) @ self._HAMMING_PESOS
+
+        # corrige (inverte o bit indicado pela síndrome)
+        corrigidos = blocos ^ self._HAMMING_CORRECAO[sindromes]
+        return corrigidos[:, self._HAMMING_DADOS].reshape(-1)
@@ -0,0 +1,189 @@
+import numpy as np
+
+from camada_enlace import ContagemCaracteres, FlagBytes
+from camada_enlace.CamadaEnlace import CamadaEnlace
+from camada_enlace.CRC32 import CRC32
+from camada_enlace.Checksum16 import Checksum16
+from camada_enlace.FlagBits import FLAG, insere_stuffing, remove_stuffing
+from comum.BufferBits import BufferBits, como_bits, como_bytes, como_quadro
+
+
+class CamadaEnlaceBytes:
+    """
+    Mesmos protocolos e mesmos nomes de CamadaEnlace, mas os quadros
+    circulam empacotados: a entrada pode ser bytes, bytearray, memoryview,
+    BufferBits (ou bits) e a saída é bytes, ou BufferBits quando o quadro
+    não fecha um número inteiro de bytes (bit stuffing, paridade, ...).
+    Os quadros produzidos são bit a bit os mesmos de CamadaEnlace.
+
+    Os bits só aparecem na fronteira com a camada física, que aceita
+    bytes e BufferBits diretamente:
+
+        enlace = CamadaEnlaceBytes()
+        quadro = enlace.encode_crc(enlace.enquadramento_flag_bytes(texto.encode()))
+        t, s = camada_fisica.nrz_polar(quadro)
+        ...
+        recebido = BufferBits.de_bits(camada_fisica.decode_nrz_polar(s))
+    """
+
+    def __init__(self):
+        # Hamming e bit stuffing são bit a bit por natureza
+        self._enlace_bits = CamadaEnlace()
+
+    @staticmethod
+    def _partes(quadro):
+        """(bytes do quadro com o último completado com zeros, número de bits)."""
+        if isinstance(quadro, (bytes, bytearray, memoryview)):
+            quadro = como_bytes(quadro)
+            return quadro, 8 * len(quadro)
+        quadro = como_quadro(quadro)
+        return quadro.empacotados().tobytes(), quadro.n_bits
+
+    @classmethod
+    def _bytes(cls, quadro):
+        return cls._partes(quadro)[0]
+
+    @staticmethod
+    def _quadro(dados, n_bits):
+        """bytes se n_bits fecha bytes inteiros; senão BufferBits."""
+        if n_bits % 8 == 0:
+            return dados[:n_bits // 8]
+        return BufferBits(dados, n_bits)
+
+    @classmethod
+    def _anexa(cls, dados, n_bits, extra, n_extra):
+        """Quadro seguido dos n_extra primeiros bits dos bytes extra (poucos: paridade, checksum, CRC)."""
+        n_inteiros, resto = divmod(n_bits, 8)
+        if resto == 0 and n_extra % 8 == 0:
+            return dados[:n_inteiros] + extra
+        # Os bits do último byte incompleto entram junto com os novos
+        cauda = np.unpackbits(np.frombuffer(dados[n_inteiros:] + extra, dtype=np.uint8))
+        cauda = np.concatenate([cauda[:resto], cauda[8 * (len(dados) - n_inteiros):][:n_extra]])
+        return cls._quadro(dados[:n_inteiros] + np.packbits(cauda).tobytes(), n_bits + n_extra)
+
+    @classmethod
+    def _corta(cls, dados, n_bits):
+        """Os primeiros n_bits do quadro (bits de sobra do último byte zerados)."""
+        n_inteiros, resto = divmod(n_bits, 8)
+        if resto == 0:
+            return dados[:n_inteiros]
+        ultimo = dados[n_inteiros] & ((0xFF << (8 - resto)) & 0xFF)
+        return BufferBits(dados[:n_inteiros] + bytes([ultimo]), n_bits)
+
+    @staticmethod
+    def _ultimos(dados, n_bits, k):
+        """Os últimos k bits do quadro, como bytes (completados com zeros)."""
+        if n_bits % 8 == 0 and k % 8 == 0:
+            return dados[n_bits // 8 - k // 8:n_bits // 8]
+        return np.packbits(BufferBits(dados, n_bits)[n_bits - k:]).tobytes()
+
+    # -------------------------------------
+    # 1.3 Protocolos de Enquadramento de Dados
+    # -------------------------------------
+
+    # --- 1. Contagem de Caracteres ---
+    def enquadramento_contagem_caracteres(self, dados):
+        return ContagemCaracteres.enquadra(self._bytes(dados))
+
+    def desenquadramento_contagem_caracteres(self, quadro):
+        return ContagemCaracteres.payload(self._bytes(quadro))
+
+    def desenquadrador_contagem_caracteres(self):
+        return ContagemCaracteres.DesenquadradorContagem()
+
+    # --- 2. Byte Stuffing (Inserção de Bytes) ---
+    def enquadramento_flag_bytes(self, dados):
+        return FlagBytes.enquadra(self._bytes(dados))
+
+    def desenquadramento_flag_bytes(self, quadro):
+        return FlagBytes.desescapa(self._bytes(quadro)[1:-1])
+
+    def desenquadrador_flag_bytes(self):
+        return FlagBytes.DesenquadradorFlagBytes()
+
+    # --- 3. Bit Stuffing (Inserção de Bits) ---
+    def enquadramento_flag_bits(self, dados):
+        bits = np.concatenate([FLAG, insere_stuffing(como_bits(como_quadro(dados))), FLAG])
+        return BufferBits.de_bits(bits).quadro()
+
+    def desenquadramento_flag_bits(self, quadro):
+        bits = remove_stuffing(como_bits(como_quadro(quadro))[8:-8])
+        return BufferBits.de_bits(bits).quadro()
+
+    # -------------------------------------
+    # 1.4 Protocolos de Detecção de Erros
+    # -------------------------------------
+
+    def encode_paridade(self, quadro):
+        dados, n = self._partes(quadro)
+        paridade = int.from_bytes(dados, "big").bit_count() % 2
+        return self._anexa(dados, n, bytes([paridade << 7]), 1)
+
+    def decode_paridade(self, quadro):
+        dados, n = self._partes(quadro)
+        if n == 0:
+            return b"", True
+        erro = int.from_bytes(dados, "big").bit_count() % 2 != 0  # dados + bit de paridade tem que ser par
+        return self._corta(dados, n - 1), erro
+
+    def encode_checksum(self, quadro):
+        """Checksum de 8 bits: complemento de 1 da soma dos bytes"""
+        dados, n = self._partes(quadro)
+        soma = sum(dados) & 0xFF
+        return self._anexa(dados, n, bytes([(~soma) & 0xFF]), 8)
+
+    def decode_checksum(self, quadro):
+        dados, n = self._partes(quadro)
+        if n < 8:
+            return self._quadro(dados, n), True
+        erro = ((~sum(dados)) & 0xFF) != 0
+        return self._corta(dados, n - 8), erro
+
+    def encode_checksum16(self, quadro):
+        """Checksum da Internet (RFC 1071), 16 bits anexados ao quadro"""
+        dados, n = self._partes(quadro)
+        return self._anexa(dados, n, Checksum16(dados).digest(), 16)
+
+    def decode_checksum16(self, quadro):
+        dados, n = self._partes(quadro)
+        if n < 16:
+            return self._quadro(dados, n), True
+        payload = self._corta(dados, n - 16)
+        recebido = int.from_bytes(self._ultimos(dados, n, 16), "big")
+        erro = not Checksum16.equivalentes(Checksum16(self._bytes(payload)).valor, recebido)
+        return payload, erro
+
+    @staticmethod
+    def _crc(dados, n_bits):
+        # Bytes inteiros pelo CRC32 por byte; os bits do último byte incompleto, um a um
+        n_inteiros, resto = divmod(n_bits, 8)
+        crc = CRC32(dados[:n_inteiros])
+        if resto:
+            crc.update_bits(np.unpackbits(np.frombuffer(dados[n_inteiros:n_inteiros + 1], dtype=np.uint8))[:resto])
+        return crc
+
+    def encode_crc(self, quadro):
+        """CRC-32 (mesmo G(x) de CamadaEnlace), 32 bits anexados ao quadro"""
+        dados, n = self._partes(quadro)
+        if n == 0:
+            return b""
+        return self._anexa(dados, n, self._crc(dados, n).digest(), 32)
+
+    def decode_crc(self, quadro):
+        dados, n = self._partes(quadro)
+        if n < 33:  # Mínimo: 1 bit dados + 32 bits CRC
+            return b"", True
+        erro = self._crc(dados, n).valor != 0
+        return self._corta(dados, n - 32), erro
+
+    # -------------------------------------
+    # 1.5 Protocolo de Correção de Erros
+    # -------------------------------------
+
+    def hamming_encode(self, quadro):
+        bits = self._enlace_bits.hamming_encode(como_bits(como_quadro(quadro)))
+        return BufferBits.de_bits(bits).quadro()
+
+    def hamming_decode(self, quadro):
+        bits = self._enlace_bits.hamming_decode(como_bits(como_quadro(quadro)))
+        return BufferBits.de_bits(bits).quadro()
@@ -0,0 +1,121 @@
+import numpy as np
+
+from comum.BufferBits import bits_de_bytes, como_bytes
+
+
+def _dobra(soma):
+    """Soma em complemento de 1: devolve os carries acima de 16 bits para baixo (end-around carry)."""
+    while soma >> 16:
+        soma = (soma & 0xFFFF) + (soma >> 16)
+    return soma
+
+
+def soma_palavras(dados):
+    """
+    Soma (sem dobrar) das palavras de 16 bits big-endian; um byte final
+    ímpar entra como palavra com zero à direita.
+    """
+    dados = como_bytes(dados)
+    palavras = np.frombuffer(dados, dtype=">u2", count=len(dados) // 2)
+    soma = int(palavras.sum(dtype=np.uint64))
+    if len(dados) % 2:
+        soma += dados[-1] << 8
+    return soma
+
+
+class Checksum16:
+    """
+    Checksum de 16 bits da Internet (RFC 1071): complemento de 1 da soma,
+    em complemento de 1, das palavras de 16 bits (big-endian) da mensagem.
+
+    A soma das palavras é feita com numpy; os carries são dobrados só no
+    fim. Incremental como CRC32:
+
+        ck = Checksum16()
+        ck.update(b"...")      # um byte ímpar fica pendente até o próximo
+        ck.digest()            # 2 bytes, MSB primeiro
+    """
+
+    def __init__(self, dados=b""):
+        self.soma = 0
+        self._impar = None  # byte alto de uma palavra ainda incompleta
+        if len(dados):
+            self.update(dados)
+
+    def update(self, dados):
+        """Acrescenta bytes (bytes, bytearray, memoryview ou array de inteiros 0..255)."""
+        dados = como_bytes(dados)
+        if not dados:
+            return self
+        if self._impar is not None:
+            self.soma += (self._impar << 8) | dados[0]
+            self._impar = None
+            dados = dados[1:]
+        if len(dados) % 2:
+            self._impar = dados[-1]
+            dados = dados[:-1]
+        self.soma = _dobra(self.soma + soma_palavras(dados))
+        return self
+
+    @property
+    def valor(self):
+        """Checksum (inteiro de 16 bits) de tudo o que foi acrescentado até agora."""
+        soma = self.soma
+        if self._impar is not None:
+            soma += self._impar << 8
+        return (~_dobra(soma)) & 0xFFFF
+
+    def digest(self):
+        return self.valor.to_bytes(2, "big")
+
+    def digest_bits(self):
+        """Os 16 bits do checksum (np.uint8, MSB primeiro), como anexados ao quadro."""
+        return bits_de_bytes(self.digest())
+
+    def copy(self):
+        outro = Checksum16()
+        outro.soma = self.soma
+        outro._impar = self._impar
+        return outro
+
+    @staticmethod
+    def atualiza(checksum, antigos, novos, deslocamento=0):
+        """
+        Atualização incremental (RFC 1624, eq. 3): HC' = ~(~HC + ~m + m').
+
+        checksum: valor anterior (inteiro de 16 bits)
+        antigos, novos: bytes trocados no quadro (mesmo tamanho)
+        deslocamento: posição, em bytes, do primeiro byte trocado
+
+        Custa proporcional ao trecho trocado, não ao quadro.
+
+        O resultado é o checksum em complemento de 1, onde 0x0000 e 0xFFFF
+        são o mesmo zero: se os dados novos somam zero (todos os bytes 0),
+        a eq. 3 dá 0x0000 e o cálculo completo dá 0xFFFF (RFC 1624, seção
+        5). Para conferir um checksum atualizado use equivalentes, não ==:
+
+        >>> dados = bytes.fromhex("0001f203f4f5f6f7")    # exemplo da RFC 1071
+        >>> hex(Checksum16(dados).valor)
+        '0x220d'
+        >>> novo = Checksum16.atualiza(0x220D, dados, bytes(8))
+        >>> hex(novo), hex(Checksum16(bytes(8)).valor)
+        ('0x0', '0xffff')
+        >>> Checksum16.equivalentes(novo, Checksum16(bytes(8)).valor)
+        True
+        """
+        antigos, novos = como_bytes(antigos), como_bytes(novos)
+        if len(antigos) != len(novos):
+            raise ValueError("antigos e novos devem ter o mesmo tamanho")
+        if deslocamento % 2:
+            # Alinha às palavras do quadro
+            antigos, novos = b"\x00" + antigos, b"\x00" + novos
+
+        # ~m em complemento de 1 é 0xFFFF - m; somar n palavras negadas = n·0xFFFF - Σm
+        n = (len(antigos) + 1) // 2
+        soma = ((~checksum) & 0xFFFF) + n * 0xFFFF - soma_palavras(antigos) + soma_palavras(novos)
+        return (~_dobra(soma)) & 0xFFFF
+
+    @staticmethod
+    def equivalentes(a, b):
+        """Se os checksums a e b (inteiros de 16 bits) são iguais em complemento de 1 (+0 = -0)."""
+        return a == b or {a, b} == {0x0000, 0xFFFF}
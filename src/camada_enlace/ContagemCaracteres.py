@@ -0,0 +1,101 @@
+import numpy as np
+
+from comum.BufferBits import como_bytes
+
+
+# O cabeçalho (1 byte) conta o quadro inteiro, ele incluso
+MAX_QUADRO = 255
+MAX_PAYLOAD = MAX_QUADRO - 1
+
+
+def enquadra(dados, max_payload=MAX_PAYLOAD):
+    """
+    Divide os dados em quadros de até max_payload bytes, cada um com o
+    byte de contagem na frente. Dados vazios geram um quadro só com o
+    cabeçalho.
+    """
+    if not 1 <= max_payload <= MAX_PAYLOAD:
+        raise ValueError(f"max_payload deve estar entre 1 e {MAX_PAYLOAD}, não {max_payload}")
+    dados = como_bytes(dados)
+    if not dados:
+        return bytes([1])
+
+    n = len(dados)
+    n_cheios, resto = divmod(n, max_payload)
+    if n_cheios == 0:
+        return bytes([n + 1]) + dados
+
+    # Quadros cheios montados de uma vez: coluna 0 = contagem, resto = payload
+    cheios = np.empty((n_cheios, max_payload + 1), dtype=np.uint8)
+    cheios[:, 0] = max_payload + 1
+    cheios[:, 1:] = np.frombuffer(dados, dtype=np.uint8, count=n_cheios * max_payload).reshape(n_cheios, max_payload)
+    saida = cheios.tobytes()
+    if resto:
+        saida += bytes([resto + 1]) + dados[n - resto:]
+    return saida
+
+
+def desenquadra(dados):
+    """
+    Percorre um fluxo de quadros saltando de contagem em contagem.
+    Retorna (payloads dos quadros completos, posição onde começa o resto
+    ainda incompleto). Contagem 0 é inválida: o byte é pulado.
+    """
+    dados = como_bytes(dados)
+    quadros = []
+    pos, n = 0, len(dados)
+    while pos < n:
+        count = dados[pos]
+        if count == 0:
+            pos += 1
+            continue
+        if pos + count > n:
+            break
+        quadros.append(dados[pos + 1:pos + count])
+        pos += count
+    return quadros, pos
+
+
+def payload(dados):
+    """
+    Payloads de todos os quadros, juntos; de um quadro final incompleto
+    fica o que chegou.
+    """
+    dados = como_bytes(dados)
+    payloads, pos = desenquadra(dados)
+    if pos < len(dados):
+        count = dados[pos]
+        payloads.append(dados[pos + 1:pos + count])
+    return b"".join(payloads)
+
+
+class DesenquadradorContagem:
+    """
+    Desenquadrador de contagem de caracteres para um fluxo contínuo de bytes:
+
+        rx = DesenquadradorContagem()
+        for bloco in blocos:
+            for payload in rx.feed(bloco):
+                ...
+
+    Só o quadro incompleto do fim de cada bloco (menos de 255 bytes) fica
+    guardado, então o custo é linear no tamanho do fluxo.
+    """
+
+    def __init__(self):
+        self._buffer = b""
+
+    def feed(self, dados):
+        """Acrescenta bytes ao fluxo e retorna os payloads dos quadros completos."""
+        buf = self._buffer + como_bytes(dados) if self._buffer else como_bytes(dados)
+        quadros, pos = desenquadra(buf)
+        self._buffer = buf[pos:]
+        return quadros
+
+    @property
+    def pendente(self):
+        """Bytes do quadro incompleto guardado."""
+        return self._buffer
+
+    def reset(self):
+        self._buffer = b""
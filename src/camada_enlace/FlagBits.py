@@ -0,0 +1,152 @@
+import numpy as np
+
+from comum.BufferBits import como_bits
+
+
+FLAG = np.array([0, 1, 1, 1, 1, 1, 1, 0], dtype=np.uint8)
+_FLAG_BYTE = 0x7E
+
+
+def corridas_uns(bits):
+    """Para cada posição, quantos '1's seguidos terminam nela (0 onde o bit é 0)."""
+    b = como_bits(bits).reshape(-1)
+    idx = np.arange(len(b))
+    ultimo_zero = np.maximum.accumulate(np.where(b == 0, idx, -1))
+    return (idx - ultimo_zero) * b
+
+
+def insere_stuffing(bits):
+    """Insere um '0' depois de cada 5 '1's seguidos dos dados."""
+    b = como_bits(bits).reshape(-1)
+    k = corridas_uns(b)
+    pos = np.flatnonzero((k > 0) & (k % 5 == 0))
+    return np.insert(b, pos + 1, np.uint8(0))
+
+
+def _mascara_stuffing(b, k):
+    """True nos '0's inseridos pelo stuffing (os que vêm depois de 5, 10, ... '1's)."""
+    remover = np.zeros(len(b), dtype=bool)
+    if len(b) > 1:
+        anterior = k[:-1]
+        remover[1:] = (b[1:] == 0) & (anterior > 0) & (anterior % 5 == 0)
+    return remover
+
+
+def remove_stuffing(bits):
+    """Remove o '0' que vem depois de cada 5 '1's seguidos (inverso de insere_stuffing)."""
+    b = como_bits(bits).reshape(-1)
+    return b[~_mascara_stuffing(b, corridas_uns(b))]
+
+
+def posicoes_flag(bits):
+    """Índices onde começa a sequência 01111110."""
+    b = como_bits(bits).reshape(-1)
+    if len(b) < 8:
+        return np.zeros(0, dtype=np.intp)
+    # Janela de 8 bits como inteiro, montada com 8 fatias deslocadas
+    n = len(b) - 7
+    janela = np.zeros(n, dtype=np.uint8)
+    for j in range(8):
+        janela |= b[j:j + n] << np.uint8(7 - j)
+    return np.flatnonzero(janela == _FLAG_BYTE)
+
+
+class DesenquadradorFlagBits:
+    """
+    Desenquadrador de bit stuffing para um fluxo contínuo de bits, com
+    quadros colados (a flag de fim de um pode ser a de início do próximo,
+    inclusive compartilhando o '0') e preenchimento entre quadros (flags
+    repetidas ou '1's).
+
+        rx = DesenquadradorFlagBits()
+        for bloco in blocos:
+            for quadro in rx.feed(bloco):   # payloads já sem stuffing
+                ...
+
+    Cada feed só percorre os bits novos (mais os 7 últimos do bloco
+    anterior, para flags partidas entre blocos). O quadro em aberto fica
+    em pedaços, juntados uma vez quando a flag de fim chega, então o custo
+    é linear no fluxo, qualquer que seja o tamanho dos quadros.
+    Trechos entre flags com 6 ou mais '1's seguidos (abort ou linha ociosa)
+    são descartados.
+    """
+
+    def __init__(self):
+        self.descartados = 0
+        self.reset()
+
+    def feed(self, bits):
+        """Acrescenta bits ao fluxo e retorna a lista de quadros completos encontrados."""
+        novos = como_bits(bits).reshape(-1)
+        buf = np.concatenate([self._cauda, novos])
+        base = self._total - len(self._cauda)  # posição no fluxo de buf[0]
+        self._total += len(novos)
+
+        quadros = []
+        flags = (posicoes_flag(buf) + base).tolist()
+        # Corridas de '1's e stuffing do bloco, calculados uma vez se há quadros
+        # inteiros nele (a corrida zera no '0' final de cada flag)
+        self._k = self._manter = None
+        if len(flags) > 1:
+            self._k = corridas_uns(buf)
+            self._manter = ~_mascara_stuffing(buf, self._k)
+        for p in flags:
+            if self._em_quadro:
+                quadro = self._fecha(p, buf, base)
+                if quadro is not None:
+                    quadros.append(quadro)
+            # Depois de cada flag começa um quadro novo
+            self._em_quadro = True
+            self._inicio = self._fim = p + 8
+            self._pedacos, self._uns = [], 0
+
+        if self._em_quadro:
+            resto = buf[max(self._fim - base, 0):]
+            self._fim = self._total
+            if not self._acrescenta(resto):
+                # Abort/linha ociosa depois da última flag: volta a procurar
+                self._em_quadro, self._pedacos = False, []
+
+        self._cauda = buf[-7:].copy()
+        return quadros
+
+    def _acrescenta(self, pedaco):
+        """Guarda bits do quadro em aberto; False se eles formam 7 ou mais '1's seguidos."""
+        if len(pedaco) == 0:
+            return True
+        self._pedacos.append(pedaco.copy())
+        k = corridas_uns(pedaco)
+        zeros = np.flatnonzero(pedaco == 0)
+        inicio = zeros[0] if len(zeros) else len(pedaco)  # '1's do começo continuam a corrida anterior
+        maior = max(int(k.max()), self._uns + int(inicio))
+        self._uns = int(k[-1]) if len(zeros) else self._uns + len(pedaco)
+        return maior < 7
+
+    def _fecha(self, p, buf, base):
+        """Quadro entre o início guardado e a flag em p (posição no fluxo), ou None."""
+        n = p - self._inicio
+        if n <= 0:
+            return None  # flags seguidas
+        if self._inicio >= base and self._k is not None:
+            # Quadro inteiro dentro do bloco atual
+            a, b = self._inicio - base, p - base
+            if self._k[a:b].max() >= 6:
+                self.descartados += 1
+                return None
+            return buf[a:b][self._manter[a:b]]
+        if p > self._fim:
+            self._pedacos.append(buf[self._fim - base:p - base])
+        quadro = np.concatenate(self._pedacos)[:n]
+        k = corridas_uns(quadro)
+        if k.max() >= 6:
+            self.descartados += 1
+            return None
+        return quadro[~_mascara_stuffing(quadro, k)]
+
+    def reset(self):
+        self._cauda = np.zeros(0, dtype=np.uint8)  # últimos 7 bits do fluxo
+        self._total = 0  # bits recebidos até agora
+        self._em_quadro = False
+        self._inicio = self._fim = 0  # posições no fluxo: começo do quadro em aberto e fim dos pedaços
+        self._pedacos, self._uns = [], 0
+        self._k = self._manter = None  # corridas/stuffing do bloco atual
@@ -0,0 +1,137 @@
+from comum.BufferBits import como_bytes
+
+
+FLAG = 0x7E  # '~'
+ESC = 0x7D  # '}'
+_FLAG = bytes([FLAG])
+_ESC = bytes([ESC])
+
+
+def escapa(dados):
+    """Antepõe ESC a cada FLAG e ESC dos dados (bytes -> bytes)."""
+    dados = como_bytes(dados)
+    # ESC primeiro, senão os ESC inseridos antes das FLAGs seriam escapados de novo
+    return dados.replace(_ESC, _ESC + _ESC).replace(_FLAG, _ESC + _FLAG)
+
+
+def desescapa(dados):
+    """
+    Inverso de escapa: cada ESC vale pelo byte seguinte, literalmente.
+    Um ESC solto no fim é descartado.
+    """
+    dados = como_bytes(dados)
+    if _ESC not in dados:
+        return dados
+
+    # Entre dois ESC consecutivos de split há um trecho; se o ESC anterior
+    # está ativo, o primeiro byte do trecho é o escapado (vale ele mesmo).
+    # Trecho vazio: o byte escapado é o próprio ESC seguinte, que então
+    # deixa de ser ativo.
+    partes = dados.split(_ESC)
+    saida = [partes[0]]
+    ativo = True
+    for parte in partes[1:]:
+        if not ativo:
+            saida.append(parte)
+            ativo = True
+        elif parte:
+            saida.append(parte)
+        else:
+            saida.append(_ESC)
+            ativo = False
+    if not ativo:
+        # O último trecho era vazio: o ESC final estava solto
+        saida.pop()
+    return b"".join(saida)
+
+
+def enquadra(dados):
+    """FLAG + dados escapados + FLAG."""
+    return _FLAG + escapa(dados) + _FLAG
+
+
+def enquadra_fluxo(lista_dados):
+    """Vários quadros colados, a FLAG de fim de um servindo de início do seguinte."""
+    return _FLAG + b"".join(escapa(d) + _FLAG for d in lista_dados)
+
+
+def _esc_no_fim(dados, esc_impar=False):
+    """Se os dados terminam com um número ímpar de ESC (o próximo byte é escapado)."""
+    sem_esc = dados.rstrip(_ESC)
+    n = len(dados) - len(sem_esc)
+    return (n % 2 == 1) != (esc_impar and not sem_esc)
+
+
+def posicoes_flag(dados, esc_impar=False):
+    """
+    Índices das FLAGs de verdade: 0x7E precedidos por um número par de ESC
+    (com um número ímpar, o 0x7E é um byte escapado dos dados).
+
+    esc_impar: os bytes anteriores a dados (num fluxo) terminavam com um
+    número ímpar de ESC.
+    """
+    dados = como_bytes(dados)
+    flags = []
+    p = dados.find(_FLAG)
+    while p >= 0:
+        # Conta os ESC logo antes (só há algum nos 0x7E escapados, que são raros);
+        # cada ESC é percorrido no máximo uma vez, pois a sequência termina neste 0x7E
+        i = p - 1
+        while i >= 0 and dados[i] == ESC:
+            i -= 1
+        n_esc = p - 1 - i + (i < 0 and esc_impar)
+        if n_esc % 2 == 0:
+            flags.append(p)
+        p = dados.find(_FLAG, p + 1)
+    return flags
+
+
+class DesenquadradorFlagBytes:
+    """
+    Desenquadrador de byte stuffing para um fluxo contínuo de bytes, com
+    quadros colados e FLAGs repetidas entre eles:
+
+        rx = DesenquadradorFlagBytes()
+        for bloco in blocos:
+            for quadro in rx.feed(bloco):   # payloads (bytes) já sem ESC
+                ...
+
+    Cada feed só percorre os bytes novos: os pedaços do quadro em aberto
+    ficam numa lista, juntados uma vez quando a FLAG de fim chega, e a
+    paridade dos ESC do fim do bloco passa para o bloco seguinte. O custo
+    é linear no fluxo, qualquer que seja o tamanho dos quadros.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def feed(self, dados):
+        """Acrescenta bytes ao fluxo e retorna a lista de quadros completos encontrados."""
+        dados = como_bytes(dados)
+        if not self._em_quadro:
+            # Procurando o início: antes da primeira FLAG não há quadro (nem ESC que valha)
+            f = dados.find(_FLAG)
+            if f < 0:
+                return []
+            dados = dados[f + 1:]
+            self._em_quadro, self._esc_impar = True, False
+
+        quadros = []
+        ini = 0
+        for f in posicoes_flag(dados, self._esc_impar):
+            self._pedacos.append(dados[ini:f])
+            quadro = b"".join(self._pedacos)
+            if quadro:  # FLAGs seguidas não formam quadro
+                quadros.append(desescapa(quadro))
+            self._pedacos = []
+            ini = f + 1
+
+        if ini < len(dados):
+            self._pedacos.append(dados[ini:])
+        self._esc_impar = _esc_no_fim(dados, self._esc_impar)
+        return quadros
+
+    def reset(self):
+        self._pedacos = []  # quadro em aberto, depois da última FLAG
+        self._em_quadro = False
+        self._esc_impar = False
@@ -1,6 +1,75 @@
 # src/camada_fisica/CamadaFisica.py
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
 import numpy as np
 
+from camada_fisica.Captura import abre_captura, grava_captura
+from camada_fisica.EixoTempo import EixoTempo
+from camada_fisica.GeradorRuido import GeradorRuido
+from comum.BufferBits import como_bits, bits_de_bytes, bytes_de_bits
+
+class CacheTabelas:
+    """
+    Cache LRU (limitado) das formas de onda de referência da camada física:
+    portadora do ASK, portadoras/referências do FSK e bases I/Q do QPSK/16-QAM.
+
+    É compartilhado por todas as instâncias de CamadaFisica do processo, de modo
+    que transmissões repetidas (ou varreduras de parâmetros) com a mesma
+    configuração não geram as tabelas de novo.
+    Chave: (modulação, samples_per_bit, V, fs, Tb, fc, dtype).
+    """
+
+    def __init__(self, maxsize=64):
+        self.maxsize = int(maxsize)
+        self.hits = 0
+        self.misses = 0
+        self._tabelas = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obter(self, chave, gerar):
+        """Retorna a tabela de `chave`; se não existir, chama gerar() e guarda o resultado."""
+        with self._lock:
+            if chave in self._tabelas:
+                self.hits += 1
+                self._tabelas.move_to_end(chave)
+                return self._tabelas[chave]
+            self.misses += 1
+
+        tabela = gerar()
+        # As tabelas são compartilhadas: ninguém deve alterá-las no lugar
+        for arr in (tabela if isinstance(tabela, tuple) else (tabela,)):
+            if isinstance(arr, np.ndarray):
+                arr.setflags(write=False)
+
+        with self._lock:
+            self._tabelas[chave] = tabela
+            self._tabelas.move_to_end(chave)
+            while len(self._tabelas) > self.maxsize:
+                self._tabelas.popitem(last=False)
+        return tabela
+
+    def info(self):
+        """Contadores do cache (no estilo de functools.lru_cache)."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "tamanho": len(self._tabelas), "maxsize": self.maxsize}
+
+    def limpar(self):
+        """Esvazia o cache e zera os contadores."""
+        with self._lock:
+            self._tabelas.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Cache global, compartilhado por todas as instâncias
+CACHE_TABELAS = CacheTabelas()
+
+
 class CamadaFisica:
 
     #--------------------------------------INICIO DA 1.1.1-------------------------------------------------
@@ -11,19 +80,45 @@ class CamadaFisica:
       - Bipolar (AMI)
 
     Cada método de codificação retorna (t, waveform) onde:
-      - t: vetor de tempos (numpy array)
+      - t: eixo de tempos (EixoTempo: se comporta como array, mas só é
+           materializado quando indexado/convertido/plotado)
       - waveform: amostras (numpy array, float)
-    Decodificadores retornam lista de bits (0/1).
+    Decodificadores retornam os bits (0/1) como array numpy (uint8).
+    Os bits de entrada podem ser listas, arrays ou BufferBits (comum.BufferBits).
+
+    Todos os moduladores e demoduladores também aceitam lotes: uma matriz
+    (n_mensagens, n_bits) gera waveforms (n_mensagens, n_amostras), e uma
+    matriz de waveforms gera uma matriz de bits (n_mensagens, n_bits).
+    O vetor t é o mesmo para todas as linhas.
+
+    O tipo das amostras é escolhido por `dtype` (float64, float32 ou float16).
+    Com float16 as amostras são apenas armazenadas em 16 bits; as contas
+    (correlações, médias, ruído) são feitas em float32.
+
+    O ruído vem de `self.ruido` (GeradorRuido): com a mesma `seed` os
+    resultados de add_awgn se repetem.
     """
 
-    def __init__(self, samples_per_bit=50, V=1.0, fs=None):
+    def __init__(self, samples_per_bit=50, V=1.0, fs=None, dtype=np.float64, seed=None, amostras_iq=4):
         """
         samples_per_bit: número de amostras por bit (inteiro)
         V: amplitude de pico
         fs: taxa de amostragem (opcional). Se None, fs = samples_per_bit / Tb (Tb=1s por bit nominal)
+        dtype: tipo das amostras de waveform, t e ruído (float64, float32 ou float16)
+        seed: semente do ruído (inteiro, SeedSequence, GeradorRuido ou None)
+        amostras_iq: amostras por símbolo do envelope complexo (modo I/Q)
         """
         self.samples_per_bit = int(samples_per_bit)
         self.V = float(V)
+        self.dtype = np.dtype(dtype)
+        if self.dtype.kind != 'f':
+            raise ValueError(f"dtype deve ser de ponto flutuante, não {self.dtype}")
+        # Tipo usado nas contas: pelo menos float32
+        self._dtype_calculo = np.result_type(self.dtype, np.float32)
+        # Envelopes complexos (I/Q): complex64, ou complex128 se dtype = float64
+        self.dtype_iq = np.result_type(self.dtype, np.complex64)
+        self.amostras_iq = int(amostras_iq)
+        self.ruido = seed if isinstance(seed, GeradorRuido) else GeradorRuido(seed)
         # se precisar usar tempo absoluto, assumimos Tb = 1.0 por símbolo para simplicidade
         self.Tb = 1.0
         self.fs = fs if fs is not None else self.samples_per_bit / self.Tb
@@ -35,41 +130,81 @@ class CamadaFisica:
         # -1 significa que o próximo '1' deve ser +1 (alterna de -1 para 1).
         self.last_polarity = -1 
         
+    # Nome da modulação (como aparece na interface) ->
+    # (método modulador, método demodulador, bits por símbolo[, parâmetros])
+    MODULACOES = {
+        "NRZ-Polar": ("nrz_polar", "decode_nrz_polar", 1),
+        "Manchester": ("manchester", "decode_manchester", 1),
+        "Bipolar (AMI)": ("bipolar_ami", "decode_bipolar_ami", 1),
+        "ASK": ("ask", "decode_ask", 1),
+        "FSK": ("fsk", "decode_fsk", 1),
+        "QPSK": ("qpsk", "decode_qpsk", 2),
+        "16-QAM": ("st_qam", "decode_st_qam", 4),
+        "4-FSK": ("mfsk", "decode_mfsk", 2, {"M": 4}),
+        "8-FSK": ("mfsk", "decode_mfsk", 3, {"M": 8}),
+        "16-FSK": ("mfsk", "decode_mfsk", 4, {"M": 16}),
+        "8-PSK": ("mpsk", "decode_mpsk", 3, {"M": 8}),
+        "16-PSK": ("mpsk", "decode_mpsk", 4, {"M": 16}),
+        "64-QAM": ("mqam", "decode_mqam", 6, {"M": 64}),
+        "256-QAM": ("mqam", "decode_mqam", 8, {"M": 256}),
+    }
+
+    def par_modulacao(self, nome):
+        """Retorna (modulador, demodulador, bits_por_simbolo) da modulação `nome`."""
+        if nome not in self.MODULACOES:
+            raise ValueError(f"Modulação desconhecida: {nome!r}")
+        mod, dec, bps, *params = self.MODULACOES[nome]
+        if params:
+            return partial(getattr(self, mod), **params[0]), partial(getattr(self, dec), **params[0]), bps
+        return getattr(self, mod), getattr(self, dec), bps
+
     # -------------------------
     # Utilitários
     # -------------------------
     @staticmethod
     def bits_from_bytes(b: bytes):
-        bits = []
-        for byte in b:
-            for i in range(8):
-                bits.append((byte >> (7 - i)) & 1)
-        return bits
+        return bits_de_bytes(b)
 
     @staticmethod
     def bytes_from_bits(bits):
         # agrupa 8 bits MSB first
-        pad = (-len(bits)) % 8
-        bits = bits + [0] * pad
-        out = bytearray()
-        for i in range(0, len(bits), 8):
-            byte = 0
-            for j in range(8):
-                byte = (byte << 1) | bits[i + j]
-            out.append(byte)
-        return bytes(out)
+        return bytes_de_bits(bits).tobytes()
 
     # -------------------------
     # Codificadores (Ex 1.1.1)
     # -------------------------
+    def _bits_array(self, bits):
+        """
+        Converte os bits para array numpy (uint8): 1-D para uma mensagem ou
+        2-D (n_mensagens, n_bits) para um lote.
+        """
+        return como_bits(bits)
+
+    @staticmethod
+    def _junta_blocos(blocos):
+        """(..., n_blocos, tamanho) -> (..., n_blocos * tamanho), concatenando cada linha."""
+        return blocos.reshape(blocos.shape[:-2] + (blocos.shape[-2] * blocos.shape[-1],))
+
+    def _seleciona_por_bit(self, tabela, bits):
+        """
+        Monta o waveform escolhendo, para cada bit, uma linha de `tabela`
+        (linha 1 para bit '1', linha 0 para os demais) e concatenando tudo.
+        """
+        idx = (self._bits_array(bits) == 1).astype(np.intp)
+        return self._junta_blocos(tabela[idx])
+
+    def _eixo_tempo(self, waveform):
+        """Eixo de tempos de um waveform (ou de cada linha de um lote)."""
+        return EixoTempo(waveform.shape[-1], self.fs, dtype=self._dtype_calculo)
+
     def nrz_polar(self, bits):
         """NRZ-Polar: 1 -> +V ; 0 -> -V"""
         s_per_bit = self.samples_per_bit
-        waveform = np.zeros(len(bits) * s_per_bit, dtype=float)
-        for i, b in enumerate(bits):
-            level = self.V if b == 1 else -self.V
-            waveform[i * s_per_bit : (i + 1) * s_per_bit] = level
-        t = np.arange(len(waveform)) / self.fs
+        b = self._bits_array(bits)
+        # Mapeamento de nível por bit e repetição de cada nível por s_per_bit amostras
+        levels = np.where(b == 1, self.V, -self.V)
+        waveform = np.repeat(levels.astype(self.dtype), s_per_bit, axis=-1)
+        t = self._eixo_tempo(waveform)
         return t, waveform
 
     def manchester(self, bits):
@@ -79,17 +214,15 @@ class CamadaFisica:
         """
         s_per_bit = self.samples_per_bit
         half = s_per_bit // 2
-     
-        waveform = []
-        for b in bits:
-            if b == 1:
-                waveform.extend([self.V] * half)
-                waveform.extend([-self.V] * (s_per_bit - half))
-            else:
-                waveform.extend([-self.V] * half)
-                waveform.extend([self.V] * (s_per_bit - half))
-        waveform = np.array(waveform, dtype=float)
-        t = np.arange(len(waveform)) / self.fs
+        b = self._bits_array(bits)
+
+        # Padrão de um bit '1' (+V na primeira metade, -V na segunda); o bit '0' é o negativo
+        pattern = np.empty(s_per_bit, dtype=self.dtype)
+        pattern[:half] = self.V
+        pattern[half:] = -self.V
+        sign = np.where(b == 1, 1.0, -1.0).astype(self.dtype)
+        waveform = self._junta_blocos(sign[..., None] * pattern)
+        t = self._eixo_tempo(waveform)
         return t, waveform
 
     def bipolar_ami(self, bits):
@@ -98,81 +231,141 @@ class CamadaFisica:
            0 -> 0
            1 -> alterna +V / -V (primeiro 1 -> +V, próximo 1 -> -V, etc)
         """
-        s_per_bit = self.samples_per_bit
-        waveform = np.zeros(len(bits) * s_per_bit, dtype=float)
-        
-        last_polarity = -1
-                          
-      
-        last_polarity = -1 # Assim o primeiro '1' é sempre +V.
-
-        for i, b in enumerate(bits):
-            if b == 0:
-                level = 0.0
-            else:
-                # alternate polarity
-                last_polarity *= -1 # -1 -> 1 (primeiro 1) ; 1 -> -1 (segundo 1)
-                level = self.V * last_polarity
-            waveform[i * s_per_bit : (i + 1) * s_per_bit] = level
-            
-        t = np.arange(len(waveform)) / self.fs
+        waveform, _ = self._ami(bits, -1)
+        t = self._eixo_tempo(waveform)
         return t, waveform
 
+    def _ami(self, bits, last_polarity):
+        """
+        Núcleo do AMI. last_polarity tem o mesmo significado de self.last_polarity
+        (-1: o próximo '1' sai +V). Retorna (waveform, last_polarity ao final),
+        o que permite continuar a alternância em outro bloco de bits.
+        """
+        levels, last_polarity = self._niveis_ami(self._bits_array(bits), last_polarity)
+        waveform = np.repeat(levels.astype(self.dtype), self.samples_per_bit, axis=-1)
+        return waveform, last_polarity
+
+    def _niveis_ami(self, b, last_polarity):
+        """Nível de cada bit no AMI e a polaridade ao final (ver _ami)."""
+        # A polaridade de cada '1' depende de quantos '1's vieram antes dele:
+        # partindo de last_polarity = -1, ímpar (1º, 3º, ...) -> +V ; par (2º, 4º, ...) -> -V
+        ones = b != 0
+        count = np.cumsum(ones, axis=-1)
+        polarity = np.where(count % 2 == 1, -last_polarity * self.V, last_polarity * self.V)
+        levels = np.where(ones, polarity, 0.0)
+
+        total = count[..., -1] if count.shape[-1] else np.zeros(count.shape[:-1], dtype=int)
+        return levels, np.where(total % 2 == 1, -last_polarity, last_polarity)
+
     # -------------------------
     # Decodificadores 
     # -------------------------
+    def _intervalos_de_bit(self, waveform, s):
+        """
+        Enxerga o waveform como uma matriz (n_bits, s) de intervalos de bit
+        (ou (n_mensagens, n_bits, s) para um lote).
+        Amostras que sobram no fim (bit incompleto) são descartadas.
+        Para arrays contíguos no tipo de cálculo o resultado é uma view (sem cópia).
+        """
+        w = np.asarray(waveform).astype(self._dtype_calculo, copy=False)
+        nb = w.shape[-1] // s
+        return w[..., :nb * s].reshape(w.shape[:-1] + (nb, s))
+
     def decode_nrz_polar(self, waveform):
         """Decodifica NRZ-Polar por média em cada intervalo de bit (threshold 0)."""
-        s = self.samples_per_bit
-        nb = len(waveform) // s
-        bits = []
-        for i in range(nb):
-            chunk = waveform[i*s:(i+1)*s]
-            m = np.mean(chunk)
-            bits.append(1 if m > 0.0 else 0)
-        return bits
+        blocos = self._intervalos_de_bit(waveform, self.samples_per_bit)
+        return self._decide_nrz_polar(blocos.mean(axis=-1))
+
+    @staticmethod
+    def _decide_nrz_polar(m):
+        return (m > 0.0).astype(np.uint8)
 
     def decode_manchester(self, waveform):
         """Decodifica Manchester examinando as duas metades do bit."""
         s = self.samples_per_bit
-        nb = len(waveform) // s
-        bits = []
         half = s//2
-        for i in range(nb):
-            chunk = waveform[i*s:(i+1)*s]
-            first_mean = np.mean(chunk[:half])
-            second_mean = np.mean(chunk[half:])
-            bits.append(1 if first_mean > second_mean else 0)
-        return bits
+        blocos = self._intervalos_de_bit(waveform, s)
+        first_mean = blocos[..., :half].mean(axis=-1)
+        second_mean = blocos[..., half:].mean(axis=-1)
+        return self._decide_manchester(first_mean - second_mean)
+
+    @staticmethod
+    def _decide_manchester(d):
+        """d = média da primeira metade - média da segunda."""
+        return (d > 0.0).astype(np.uint8)
 
     def decode_bipolar_ami(self, waveform):
         """Decodifica AMI: decide 0 se média próxima de 0, senão 1."""
-        s = self.samples_per_bit
-        nb = len(waveform) // s
-        bits = []
-        for i in range(nb):
-            chunk = waveform[i*s:(i+1)*s]
-            m = np.mean(chunk)
-            # threshold: se |m| < V/2 -> zero
-            if abs(m) < (self.V * 0.4):
-                bits.append(0)
-            else:
-                bits.append(1)
-        return bits
+        blocos = self._intervalos_de_bit(waveform, self.samples_per_bit)
+        return self._decide_bipolar_ami(blocos.mean(axis=-1))
+
+    def _decide_bipolar_ami(self, m):
+        # threshold: se |m| < V/2 -> zero
+        return (np.abs(m) >= (self.V * 0.4)).astype(np.uint8)
 
     # -------------------------
     # Função utilitária: adicionar ruído AWGN
     # -------------------------
-    def add_awgn(self, waveform, snr_db):
+    def potencia(self, waveform):
+        """Potência média do sinal (por linha, no caso de um lote), com keepdims."""
+        w = np.asarray(waveform)
+        if np.iscomplexobj(w):
+            return np.mean(w.real ** 2 + w.imag ** 2, axis=-1, keepdims=True, dtype=self._dtype_calculo)
+        return np.mean(np.square(w, dtype=self._dtype_calculo), axis=-1, keepdims=True)
+
+    def _ruido_unitario(self, shape, complexo=False):
+        """Ruído de potência 1: real, ou complexo circular (1/2 em I e 1/2 em Q)."""
+        calc = self._dtype_calculo
+        if not complexo:
+            return self.ruido.unitario(shape, dtype=calc)
+        ruido = np.empty(shape, dtype=np.result_type(calc, np.complex64))
+        ruido.real = self.ruido.unitario(shape, dtype=calc)
+        ruido.imag = self.ruido.unitario(shape, dtype=calc)
+        ruido *= np.sqrt(0.5)
+        return ruido
+
+    def _desvio_ruido(self, sig_pow, snr_db):
+        snr_linear = 10**(snr_db/10.0)
+        noise_pow = np.where(snr_linear != 0, sig_pow / snr_linear, sig_pow * 0.001)
+        return np.sqrt(noise_pow).astype(self._dtype_calculo)
+
+    def add_awgn(self, waveform, snr_db, potencia=None):
         """
         Adiciona ruído AWGN ao waveform para um SNR (dB) fornecido.
         SNR definido como 10*log10(signal_power / noise_power).
+        Para um lote (n_mensagens, n_amostras) a potência é medida por linha,
+        e snr_db pode ser um escalar ou um valor por linha.
+        potencia: potência do sinal já calculada (ver `potencia`), para não
+        medi-la de novo a cada chamada.
+        Envelopes complexos recebem ruído complexo circular com a mesma
+        definição de SNR por amostra (ver também add_awgn_iq).
         """
-        sig_pow = np.mean(waveform**2)
-        snr_linear = 10**(snr_db/10.0)
-        noise_pow = sig_pow / snr_linear if snr_linear != 0 else sig_pow * 0.001
-        noise = np.sqrt(noise_pow) * np.random.randn(len(waveform))
-        return waveform + noise
+        waveform = np.asarray(waveform)
+        calc = self._dtype_calculo
+        complexo = np.iscomplexobj(waveform)
+        sig_pow = self.potencia(waveform) if potencia is None else np.asarray(potencia, dtype=calc)
+        snr_db = np.asarray(snr_db, dtype=float)
+        if snr_db.ndim > 0:
+            snr_db = snr_db[..., None]
+        noise = self._ruido_unitario(waveform.shape, complexo) * self._desvio_ruido(sig_pow, snr_db)
+        return (waveform + noise).astype(self.dtype_iq if complexo else self.dtype, copy=False)
+
+    def add_awgn_snrs(self, waveform, snrs_db, potencia=None):
+        """
+        O mesmo waveform com ruído em vários SNRs de uma vez.
+        Retorna um array (len(snrs_db), *waveform.shape); a linha i tem SNR
+        snrs_db[i]. Um único sorteio de ruído unitário é escalado para cada
+        SNR, então as linhas diferem só na intensidade do mesmo ruído.
+        """
+        waveform = np.asarray(waveform)
+        calc = self._dtype_calculo
+        complexo = np.iscomplexobj(waveform)
+        sig_pow = self.potencia(waveform) if potencia is None else np.asarray(potencia, dtype=calc)
+        snrs_db = np.asarray(snrs_db, dtype=float).reshape((-1,) + (1,) * waveform.ndim)
+        unit = self._ruido_unitario(waveform.shape, complexo)
+        noise = self._desvio_ruido(sig_pow, snrs_db) * unit
+        noise += waveform
+        return noise.astype(self.dtype_iq if complexo else self.dtype, copy=False)
     
 
     #--------------------------------------FIM DA 1.1.1-------------------------------------------------
@@ -180,304 +373,811 @@ class CamadaFisica:
     # -------------------------
     # Modulador (Ex 1.1.2) ASK
     # -------------------------
-    def ask(self, bits):
-        s_per_bit = self.samples_per_bit
-        t_bit = np.arange(s_per_bit) / self.fs
-        carrier = self.V * np.sin(2 * np.pi * self.fc * t_bit)
-
-        waveform = np.array([], dtype=float)
-        zero_signal = np.zeros(s_per_bit)
+    def _tabela_ask(self):
+        """Tabela de formas de onda por bit: linha 0 -> bit '0', linha 1 -> bit '1'."""
+        def gerar():
+            s_per_bit = self.samples_per_bit
+            t_bit = np.arange(s_per_bit) / self.fs
+            carrier = self.V * np.sin(2 * np.pi * self.fc * t_bit)
+            zero_signal = np.zeros(s_per_bit)
+            return np.stack([zero_signal, carrier]).astype(self.dtype)
+
+        chave = ('ASK', self.samples_per_bit, self.V, self.fs, self.Tb, self.fc, self.dtype.str)
+        return CACHE_TABELAS.obter(chave, gerar)
 
-        for b in bits:
-            if b == 1:
-                waveform = np.append(waveform, carrier)
-            else:
-                waveform = np.append(waveform, zero_signal)
+    def ask(self, bits):
+        tabela = self._tabela_ask()
+        waveform = self._seleciona_por_bit(tabela, bits)
 
-        t = np.arange(len(waveform)) / self.fs
+        t = self._eixo_tempo(waveform)
         return t, waveform
 
     def decode_ask(self, waveform):
-        s = self.samples_per_bit
-        nb = len(waveform) // s
+        blocos = self._intervalos_de_bit(waveform, self.samples_per_bit)
+        # Potência média de cada intervalo, sem materializar blocos ** 2
+        power = np.einsum('...ij,...ij->...i', blocos, blocos) / self.samples_per_bit
+        return self._decide_ask(power)
+
+    def _decide_ask(self, power):
         threshold = (self.V ** 2) / 4.0  # Limiar baseado em 1/4 da potência
-        bits = []
-        for i in range(nb):
-            chunk = waveform[i * s:(i + 1) * s]
-            power = np.mean(chunk ** 2)
-            bits.append(1 if power > threshold else 0)
-        return bits
+        return (power > threshold).astype(np.uint8)
 
     # -------------------------
     # Modulador (Ex 1.1.2) FSK
     # -------------------------
-    def fsk(self, bits):
-        """Modulação FSK, baseada na imagem (reinicia a fase a cada bit)"""
-        s_per_bit = self.samples_per_bit
-        t_bit = np.arange(s_per_bit) / self.fs
+    def _tabelas_fsk(self):
+        """
+        Retorna (tabela, refs):
+          - tabela: portadoras por bit (linha 0 -> f2, linha 1 -> f1)
+          - refs: matriz (samples_per_bit, 4) com sen/cos de f1 e f2 para o receptor
+        """
+        def gerar():
+            s_per_bit = self.samples_per_bit
+            t_bit = np.arange(s_per_bit) / self.fs
 
-        # Pré-calcula a portadora para bit '1' (freq f1)
-        carrier_1 = self.V * np.sin(2 * np.pi * self.f1_fsk * t_bit)
+            # Pré-calcula a portadora para bit '1' (freq f1)
+            carrier_1 = self.V * np.sin(2 * np.pi * self.f1_fsk * t_bit)
 
-        # Pré-calcula a portadora para bit '0' (freq f2)
-        carrier_0 = self.V * np.sin(2 * np.pi * self.f2_fsk * t_bit)
+            # Pré-calcula a portadora para bit '0' (freq f2)
+            carrier_0 = self.V * np.sin(2 * np.pi * self.f2_fsk * t_bit)
 
-        waveform = np.array([], dtype=float)
+            refs = self._referencias_tons([self.f1_fsk, self.f2_fsk], t_bit)
+            return np.stack([carrier_0, carrier_1]).astype(self.dtype), refs.astype(self._dtype_calculo)
 
-        # Constrói a forma de onda bit a bit
-        for b in bits:
-            if b == 1:
-                waveform = np.append(waveform, carrier_1)
-            else:
-                waveform = np.append(waveform, carrier_0)
+        chave = ('FSK', self.samples_per_bit, self.V, self.fs, self.Tb, (self.f1_fsk, self.f2_fsk), self.dtype.str)
+        return CACHE_TABELAS.obter(chave, gerar)
 
-        t = np.arange(len(waveform)) / self.fs
+    def fsk(self, bits):
+        """Modulação FSK, baseada na imagem (reinicia a fase a cada bit)"""
+        # Seleciona a portadora de cada bit numa única alocação
+        tabela, _ = self._tabelas_fsk()
+        waveform = self._seleciona_por_bit(tabela, bits)
+
+        t = self._eixo_tempo(waveform)
         return t, waveform
 
     def decode_fsk(self, waveform):
         """Decodificador FSK não-coerente (baseado em energia)"""
         s = self.samples_per_bit
-        nb = len(waveform) // s
-        bits = []
+        blocos = self._intervalos_de_bit(waveform, s)
+
+        # Referências (seno/cosseno) de f1 e f2, vindas do cache
+        _, refs = self._tabelas_fsk()
+
+        # Todas as correlações de uma vez: (n_bits, s) @ (s, 4)
+        return self._decide_fsk(blocos @ refs)
 
-        # Cria vetores de tempo e referências (seno/cosseno) uma vez
-        t_bit = np.arange(s) / self.fs
-        ref_sin_f1 = np.sin(2 * np.pi * self.f1_fsk * t_bit)
-        ref_cos_f1 = np.cos(2 * np.pi * self.f1_fsk * t_bit)
-        ref_sin_f2 = np.sin(2 * np.pi * self.f2_fsk * t_bit)
-        ref_cos_f2 = np.cos(2 * np.pi * self.f2_fsk * t_bit)
+    @staticmethod
+    def _decide_fsk(corr):
+        """corr: (..., 4) correlações com sen/cos de f1 e sen/cos de f2."""
+        energy_f1 = corr[..., 0] ** 2 + corr[..., 1] ** 2
+        energy_f2 = corr[..., 2] ** 2 + corr[..., 3] ** 2
 
-        for i in range(nb):
-            chunk = waveform[i * s:(i + 1) * s]
+        # Decide o bit com base na maior energia
+        return (energy_f1 > energy_f2).astype(np.uint8)
 
-            # Calcula a energia na frequência f1
-            corr_sin_f1 = np.sum(chunk * ref_sin_f1)
-            corr_cos_f1 = np.sum(chunk * ref_cos_f1)
-            energy_f1 = corr_sin_f1 ** 2 + corr_cos_f1 ** 2
+    @staticmethod
+    def _referencias_tons(freqs, t):
+        """Matriz (len(t), 2 * len(freqs)) com as colunas sen, cos de cada tom, nessa ordem."""
+        fase = 2 * np.pi * np.multiply.outer(t, np.asarray(freqs, dtype=float))
+        return np.stack([np.sin(fase), np.cos(fase)], axis=-1).reshape(len(t), -1)
 
-            # Calcula a energia na frequência f2
-            corr_sin_f2 = np.sum(chunk * ref_sin_f2)
-            corr_cos_f2 = np.sum(chunk * ref_cos_f2)
-            energy_f2 = corr_sin_f2 ** 2 + corr_cos_f2 ** 2
+    # -------------------------
+    # M-FSK (4, 8, 16, ... tons)
+    # -------------------------
+    @staticmethod
+    def _bits_por_simbolo(M):
+        """log2(M), para M potência de 2."""
+        bits_per_symbol = int(M).bit_length() - 1
+        if M < 2 or 1 << bits_per_symbol != M:
+            raise ValueError(f"M deve ser uma potência de 2 (>= 2), não {M}")
+        return bits_per_symbol
+
+    def _tabelas_mfsk(self, M):
+        """
+        Retorna (tabela, refs):
+          - tabela: (M, samples_per_symbol), tom de cada símbolo
+          - refs: (samples_per_symbol, 2M) com sen/cos de todos os tons
+        O tom k tem frequência (k + 1) / Ts: um número inteiro de ciclos por
+        símbolo, ou seja, os tons são bins da DFT do símbolo (ortogonais).
+        """
+        bits_per_symbol = self._bits_por_simbolo(M)
+        samples_per_symbol = bits_per_symbol * self.samples_per_bit
+        Ts = bits_per_symbol * self.Tb
+        freqs = (np.arange(M) + 1) / Ts
+        if freqs[-1] >= self.fs / 2:
+            raise ValueError(f"{M}-FSK precisa de fs > {2 * freqs[-1]:g} (fs = {self.fs:g}); "
+                             f"aumente samples_per_bit")
+
+        def gerar():
+            t_local = np.arange(samples_per_symbol) / self.fs
+            refs = self._referencias_tons(freqs, t_local)
+            tabela = self.V * refs[:, 0::2].T
+            return tabela.astype(self.dtype), refs.astype(self._dtype_calculo)
+
+        chave = ('M-FSK', self.samples_per_bit, self.V, self.fs, self.Tb, M, self.dtype.str)
+        return CACHE_TABELAS.obter(chave, gerar)
+
+    def mfsk(self, bits, M=4):
+        """M-FSK: cada grupo de log2(M) bits escolhe um de M tons (fase reiniciada a cada símbolo)."""
+        bits_per_symbol = self._bits_por_simbolo(M)
+        tabela, _ = self._tabelas_mfsk(M)
+        simbolos = self._indices_de_simbolo(bits, bits_per_symbol)
+        waveform = self._junta_blocos(tabela[simbolos])
+
+        t = self._eixo_tempo(waveform)
+        return t, waveform
 
-            # Decide o bit com base na maior energia
-            bits.append(1 if energy_f1 > energy_f2 else 0)
+    def decode_mfsk(self, waveform, M=4):
+        """
+        Decodificador M-FSK não-coerente: projeta todos os símbolos em todos
+        os bins de uma vez, (n_simbolos, sps) @ (sps, 2M), e escolhe o tom de
+        maior energia. Custo O(n_amostras * M) numa única multiplicação.
+        """
+        bits_per_symbol = self._bits_por_simbolo(M)
+        _, refs = self._tabelas_mfsk(M)
+        blocos = self._intervalos_de_bit(waveform, bits_per_symbol * self.samples_per_bit)
+        return self._decide_mfsk(blocos @ refs, bits_per_symbol)
 
-        return bits
+    def _decide_mfsk(self, corr, bits_per_symbol):
+        """corr: (..., 2M) correlações sen/cos de cada tom."""
+        energia = np.square(corr).reshape(corr.shape[:-1] + (corr.shape[-1] // 2, 2)).sum(axis=-1)
+        return self._bits_de_indices(np.argmax(energia, axis=-1), bits_per_symbol)
 
     # -------------------------
     # Modulador (Ex 1.1.2) QPSK
     # -------------------------
-    ''' Tavez seja bom calcular BER'''
-    def bits_to_symbols(self, bits, modulation='QPSK'):
-        ''' Função para agrupar bits em síbolos (2 bits p/ QPSK e 4 bits p/ 16-QAM'''
-        if modulation == 'QPSK':
-            bits_per_symbol = 2
-        else:
-            bits_per_symbol = 4
-
-        # Padding
-        if len(bits) % bits_per_symbol != 0:
-            pad = bits_per_symbol - (len(bits) % bits_per_symbol)
-            bits = bits + [0] * pad
+    def _indices_de_simbolo(self, bits, bits_per_symbol):
+        """
+        Agrupa os bits em símbolos (com padding de zeros até completar o último)
+        e devolve o índice inteiro de cada símbolo (MSB primeiro).
+        """
+        b = self._bits_array(bits).astype(np.intp)
+        pad = (-b.shape[-1]) % bits_per_symbol
+        if pad:
+            b = np.concatenate([b, np.zeros(b.shape[:-1] + (pad,), dtype=np.intp)], axis=-1)
+        pesos = 1 << np.arange(bits_per_symbol - 1, -1, -1)
+        n_simbolos = b.shape[-1] // bits_per_symbol
+        return b.reshape(b.shape[:-1] + (n_simbolos, bits_per_symbol)) @ pesos
 
-        simbolos = []
-        for i in range(0, len(bits), bits_per_symbol):
-            simbolo = tuple(bits[i:i + bits_per_symbol])
-            simbolos.append(simbolo)
+    @staticmethod
+    def _bits_de_indices(indices, bits_per_symbol):
+        """Inverso de _indices_de_simbolo: índice do símbolo -> bits (MSB primeiro)."""
+        deslocamentos = np.arange(bits_per_symbol - 1, -1, -1)
+        bits = ((indices[..., None] >> deslocamentos) & 1).astype(np.uint8)
+        return CamadaFisica._junta_blocos(bits)
 
-        return simbolos
+    def _base_iq(self, bits_per_symbol):
+        """
+        Base I/Q de um símbolo: matriz (samples_per_symbol, 2) com as colunas
+        I(t) e Q(t), e a energia E da portadora. Vem do cache global, então é
+        calculada uma única vez para cada configuração.
+        """
+        samples_per_symbol = bits_per_symbol * self.samples_per_bit
+        Ts = bits_per_symbol * self.Tb  # Duração do símbolo
+        fc = 1 / Ts  # 1 ciclo por símbolo
 
-    def qpsk(self, bits):
-        simbolos = self.bits_to_symbols(bits, 'QPSK') # Agrupamento de 2 bits por símbolo
-        samples_per_symbol = 2 * self.samples_per_bit
-        Ts = 2 * self.Tb  # Duração do símbolo
-        fs = self.fs
-        fc = 1/Ts  # 1 ciclo por símbolo (Nyquist)
-
-        waveform = np.zeros(len(simbolos) * samples_per_symbol, dtype=float)
-
-        # Gray mapping
-        mapping = {
-            (0, 0): (self.V, self.V), # Fase: 45º
-            (0, 1): (-self.V, self.V), # Fase: 135º
-            (1, 1): (-self.V, -self.V), # Fase: 225º
-            (1, 0): (self.V, -self.V) # Fase: 315º
-        }
-
-        for i, simb in enumerate(simbolos):
-            t_local = np.arange(0, samples_per_symbol) / fs
-
-            # Geração de Portadora
+        def gerar():
+            t_local = np.arange(0, samples_per_symbol) / self.fs
             I_t = np.sqrt(2 / Ts) * np.cos(2 * np.pi * fc * t_local)
             Q_t = -np.sqrt(2 / Ts) * np.sin(2 * np.pi * fc * t_local)
-            aI, aQ = mapping[simb] # x(t) e y(t)
+            base = np.stack([I_t, Q_t], axis=1)
+            E = np.sum(I_t ** 2)  # Energia da portadora
+            return base.astype(self._dtype_calculo), E
+
+        # A base não depende de V
+        chave = ('I/Q', self.samples_per_bit, None, self.fs, self.Tb, fc, self._dtype_calculo.str)
+        return CACHE_TABELAS.obter(chave, gerar)
+
+    def _sintetiza_iq(self, aI, aQ, bits_per_symbol):
+        """s(t) = aI*I(t) + aQ*Q(t) para todos os símbolos (produto externo)."""
+        base, _ = self._base_iq(bits_per_symbol)
+        aI = aI.astype(base.dtype, copy=False)
+        aQ = aQ.astype(base.dtype, copy=False)
+        s = np.multiply.outer(aI, base[:, 0]) + np.multiply.outer(aQ, base[:, 1])
+        return self._junta_blocos(s).astype(self.dtype, copy=False)
+
+    def _projeta_iq(self, waveform, bits_per_symbol):
+        """Projeção de todos os símbolos na base I/Q: (n_simbolos, sps) @ (sps, 2)."""
+        base, E = self._base_iq(bits_per_symbol)
+        samples_per_symbol = bits_per_symbol * self.samples_per_bit
+        blocos = self._intervalos_de_bit(waveform, samples_per_symbol)
+        proj = (blocos @ base) / E
+        return proj[..., 0], proj[..., 1]
+
+    # -------------------------
+    # Constelações: M-PSK e M-QAM quadrada, com código Gray
+    # -------------------------
+    @staticmethod
+    def _gray(n):
+        """Código Gray: posição k -> rótulo k ^ (k >> 1) (vizinhos diferem em 1 bit)."""
+        k = np.arange(n)
+        return k ^ (k >> 1)
+
+    def _tabela_psk(self, M):
+        """
+        Retorna (pontos, rotulos):
+          - pontos: (M, 2), coordenadas (I, Q) de cada rótulo de símbolo,
+            com raio √2 (para M = 4: (±1, ±1), o QPSK)
+          - rotulos: rótulo Gray de cada posição k do círculo, de fase π/M + 2πk/M
+        """
+        def gerar():
+            fase = np.pi / M + 2 * np.pi * np.arange(M) / M
+            rotulos = self._gray(M)
+            pontos = np.empty((M, 2))
+            pontos[rotulos] = np.sqrt(2) * np.stack([np.cos(fase), np.sin(fase)], axis=1)
+            return pontos, rotulos
 
-            # Portadora modulada
-            s = aI * I_t + aQ * Q_t
-            inicio = i * samples_per_symbol
-            fim = inicio + samples_per_symbol
-            waveform[inicio:fim] = s
+        return CACHE_TABELAS.obter(('PSK', M), gerar)
 
-        t = np.arange(len(waveform)) / fs
+    def _tabela_qam(self, M):
+        """
+        M-QAM quadrada (M = 4, 16, 64, 256, ...): L = √M níveis por eixo,
+        igualmente espaçados em [-1, 1]. Os primeiros log2(L) bits do símbolo
+        escolhem o nível de I e os últimos o de Q, cada eixo com código Gray.
+        Retorna (niveis, nivel_do_rotulo, rotulo_do_nivel).
+        """
+        def gerar():
+            L = 1 << (self._bits_por_simbolo(M) // 2)
+            if L * L != M:
+                raise ValueError(f"M-QAM quadrada precisa de M = 4, 16, 64, 256, ..., não {M}")
+            rotulo_do_nivel = self._gray(L)
+            return np.linspace(-1.0, 1.0, L), np.argsort(rotulo_do_nivel), rotulo_do_nivel
+
+        return CACHE_TABELAS.obter(('QAM', M), gerar)
+
+    def _amplitudes_psk(self, bits, M):
+        simbolos = self._indices_de_simbolo(bits, self._bits_por_simbolo(M))
+        pontos, _ = self._tabela_psk(M)
+        return self.V * pontos[simbolos, 0], self.V * pontos[simbolos, 1]
+
+    def _decide_psk(self, I_hat, Q_hat, M):
+        """Setor angular de cada símbolo -> rótulo Gray."""
+        _, rotulos = self._tabela_psk(M)
+        fase = np.mod(np.arctan2(Q_hat, I_hat), 2 * np.pi)
+        posicao = np.floor(fase * (M / (2 * np.pi))).astype(np.intp) % M
+        return self._bits_de_indices(rotulos[posicao], self._bits_por_simbolo(M))
+
+    def _amplitudes_qam(self, bits, M):
+        bits_per_symbol = self._bits_por_simbolo(M)
+        simbolos = self._indices_de_simbolo(bits, bits_per_symbol)
+        niveis, nivel_do_rotulo, _ = self._tabela_qam(M)
+        # O vértice da constelação tem amplitude V (níveis de ±V/√2 por eixo)
+        escala = self.V / np.sqrt(2)
+        meio = bits_per_symbol // 2
+        aI = escala * niveis[nivel_do_rotulo[simbolos >> meio]]
+        aQ = escala * niveis[nivel_do_rotulo[simbolos & ((1 << meio) - 1)]]
+        return aI, aQ
+
+    def _decide_qam(self, I_hat, Q_hat, M):
+        """Quantização de cada eixo no nível mais próximo (por arredondamento)."""
+        bits_per_symbol = self._bits_por_simbolo(M)
+        niveis, _, rotulo_do_nivel = self._tabela_qam(M)
+        L = len(niveis)
+        escala = self.V / np.sqrt(2)
+
+        def nivel(x):
+            n = np.rint((x / escala + 1.0) * ((L - 1) / 2))
+            return np.clip(n, 0, L - 1).astype(np.intp)
+
+        meio = bits_per_symbol // 2
+        simbolos = (rotulo_do_nivel[nivel(I_hat)] << meio) | rotulo_do_nivel[nivel(Q_hat)]
+        return self._bits_de_indices(simbolos, bits_per_symbol)
+
+    def mpsk(self, bits, M=8):
+        """M-PSK com código Gray ao longo do círculo (M = 4 é o QPSK)."""
+        aI, aQ = self._amplitudes_psk(bits, M)
+        waveform = self._sintetiza_iq(aI, aQ, self._bits_por_simbolo(M))
+
+        t = self._eixo_tempo(waveform)
         return t, waveform
 
-    def decode_qpsk(self, waveform):
-        samples_per_symbol = 2 * self.samples_per_bit
-        Ts = 2 * self.Tb
-        fs = self.fs
-        fc = 1/Ts
-        num_symbols = len(waveform) // samples_per_symbol
-
-        bits = []
-        for i in range(num_symbols):
-            inicio = i * samples_per_symbol
-            fim = inicio + samples_per_symbol
-            simbolo = waveform[inicio:fim]
-            t_local = np.arange(0, samples_per_symbol) / fs
-            I_t = np.sqrt(2 / Ts) * np.cos(2 * np.pi * fc * t_local)
-            Q_t = -np.sqrt(2 / Ts) * np.sin(2 * np.pi * fc * t_local)
+    def decode_mpsk(self, waveform, M=8):
+        I_hat, Q_hat = self._projeta_iq(waveform, self._bits_por_simbolo(M))
+        return self._decide_psk(I_hat, Q_hat, M)
 
-            # Correlações (projeções)
-            corr_I = np.sum(simbolo * I_t)
-            corr_Q = np.sum(simbolo * Q_t)
+    def mqam(self, bits, M=16):
+        """M-QAM quadrada com código Gray por eixo."""
+        aI, aQ = self._amplitudes_qam(bits, M)
 
-            # Normalização
-            E = np.sum(I_t ** 2)  # Energia da portadora
-            I_hat = corr_I / E
-            Q_hat = corr_Q / E
-            
-            # Gray mapping
-            if I_hat > 0 and Q_hat > 0:
-                bits.extend([0, 0])
-            elif I_hat < 0 and Q_hat > 0:
-                bits.extend([0, 1])
-            elif I_hat < 0 and Q_hat < 0:
-                bits.extend([1, 1])
-            else:  # I_hat > 0 and Q_hat < 0
-                bits.extend([1, 0])
-        return bits
+        # s(t) = x(t)cos(2pifct) - y(t)sin(2pifct)
+        waveform = self._sintetiza_iq(aI, aQ, self._bits_por_simbolo(M))
+
+        t = self._eixo_tempo(waveform)
+        return t, waveform
+
+    def decode_mqam(self, waveform, M=16):
+        # Correlação (extração I(t) e Q(t))
+        I_hat, Q_hat = self._projeta_iq(waveform, self._bits_por_simbolo(M))
+        return self._decide_qam(I_hat, Q_hat, M)
 
     # -------------------------
-    # Modulador (Ex 1.1.2) 16-QAM
+    # Modulador (Ex 1.1.2) QPSK e 16-QAM
     # -------------------------
+    # QPSK: 00 -> 45º, 01 -> 135º, 11 -> 225º, 10 -> 315º (pontos (±V, ±V))
+    def qpsk(self, bits):
+        return self.mpsk(bits, M=4)
+
+    def decode_qpsk(self, waveform):
+        return self.decode_mpsk(waveform, M=4)
+
+    # 16-QAM: níveis ±V/√2 e ±V/(3√2) por eixo; b0 b1 -> I, b2 b3 -> Q
     def st_qam(self, bits):
-        simbolos = self.bits_to_symbols(bits, '16-QAM') # Agrupamento de 4 bits por símbolo
-        samples_per_symbol = 4 * self.samples_per_bit
-        Ts = 4 * self.Tb
-        fs = self.fs
-        fc = 1 / Ts
-
-        waveform = np.zeros(len(simbolos) * samples_per_symbol, dtype=float)
-
-        # Níveis da constelação 16-QAM quadrada
-        sqrt2 = np.sqrt(2)
-        level1 = -1 / sqrt2 * self.V      # -1/√2
-        level2 = -1 / (3 * sqrt2) * self.V # -1/(3√2)
-        level3 = 1 / (3 * sqrt2) * self.V  # +1/(3√2)
-        level4 = 1 / sqrt2 * self.V       # +1/√2
-
-        # Gray mapping
-        mapping = {
-            (0, 0, 0, 0): (level2, level2),  # -1/(3√2), -1/(3√2)
-            (0, 0, 0, 1): (level2, level1),  # -1/(3√2), -1/√2
-            (0, 0, 1, 1): (level2, level3),  # -1/(3√2), +1/(3√2)
-            (0, 0, 1, 0): (level2, level4),  # -1/(3√2), +1/√2
-            (0, 1, 0, 0): (level1, level2),  # -1/√2, -1/(3√2)
-            (0, 1, 0, 1): (level1, level1),  # -1/√2, -1/√2
-            (0, 1, 1, 1): (level1, level3),  # -1/√2, +1/(3√2)
-            (0, 1, 1, 0): (level1, level4),  # -1/√2, +1/√2
-            (1, 1, 0, 0): (level3, level2),  # +1/(3√2), -1/(3√2)
-            (1, 1, 0, 1): (level3, level1),  # +1/(3√2), -1/√2
-            (1, 1, 1, 1): (level3, level3),  # +1/(3√2), +1/(3√2)
-            (1, 1, 1, 0): (level3, level4),  # +1/(3√2), +1/√2
-            (1, 0, 0, 0): (level4, level2),  # +1/√2, -1/(3√2)
-            (1, 0, 0, 1): (level4, level1),  # +1/√2, -1/√2
-            (1, 0, 1, 1): (level4, level3),  # +1/√2, +1/(3√2)
-            (1, 0, 1, 0): (level4, level4),  # +1/√2, +1/√2
-        }
-
-        for i, simb in enumerate(simbolos):
-            aI, aQ = mapping[simb]
-
-            t_local = np.arange(0, samples_per_symbol) / fs
-            I_t = np.sqrt(2 / Ts) * np.cos(2 * np.pi * fc * t_local)
-            Q_t = -np.sqrt(2 / Ts) * np.sin(2 * np.pi * fc * t_local)
+        return self.mqam(bits, M=16)
 
-            # s(t) = x(t)cos(2pifct) - y(t)sin(2pifct)
-            s = aI * I_t + aQ * Q_t
+    def decode_st_qam(self, waveform):
+        return self.decode_mqam(waveform, M=16)
 
-            ini = i * samples_per_symbol
-            fim = ini + samples_per_symbol
-            waveform[ini:fim] = s
+    # -------------------------
+    # Modo rápido (nível de símbolo)
+    # -------------------------
+    def canal_simbolos(self, modulacao, bits, snr_db):
+        """
+        Equivalente estatístico de demodular(add_awgn(modular(bits), snr_db))
+        que não gera as amostras do waveform.
+
+        Os demoduladores decidem a partir de k estatísticas lineares por
+        símbolo (média, diferença de médias, correlações, projeções I/Q),
+        ou seja, estatística = bloco @ R com R de (samples_per_symbol, k).
+        Com ruído branco de variância σ² por amostra, o ruído dessas
+        estatísticas é gaussiano com covariância σ² RᵀR; basta sortear k
+        valores por símbolo. σ vem da potência que o waveform teria, como
+        em add_awgn. O ASK decide por energia e usa a distribuição exata da
+        energia do bloco ruidoso. As decisões são as mesmas dos decode_*.
+
+        Aceita lotes (n_mensagens, n_bits), com snr_db escalar ou por linha.
+        """
+        metodo, _, _, *params = self.MODULACOES[modulacao]
+        kwargs = params[0] if params else {}
+        return getattr(self, '_canal_' + metodo)(self._bits_array(bits), snr_db, **kwargs)
+
+    def _sigma_simbolos(self, energia, samples_per_symbol, snr_db):
+        """σ do ruído por amostra (por linha), a partir da energia de cada símbolo."""
+        n_amostras = max(energia.shape[-1] * samples_per_symbol, 1)
+        sig_pow = energia.sum(axis=-1, keepdims=True) / n_amostras
+        snr_db = np.asarray(snr_db, dtype=float)
+        if snr_db.ndim > 0:
+            snr_db = snr_db[..., None]
+        return self._desvio_ruido(sig_pow, snr_db)
+
+    def _estatisticas_ruidosas(self, sinal, energia, R, snr_db):
+        """
+        sinal: (..., n_simbolos, k) estatísticas sem ruído (bloco @ R)
+        energia: (..., n_simbolos) energia de cada símbolo transmitido
+        R: (samples_per_symbol, k)
+        """
+        calc = self._dtype_calculo
+        sigma = self._sigma_simbolos(energia, R.shape[0], snr_db)
+        # Fator de RᵀR por autovalores (RᵀR pode ser singular, ex.: referência nula)
+        w, vetores = np.linalg.eigh(R.T @ R)
+        fator = (vetores * np.sqrt(np.clip(w, 0.0, None))).astype(calc)
+        k = sinal.shape[-1]
+        ruido = self.ruido.unitario(sinal.shape, dtype=calc)
+        if k == 1:
+            ruido = ruido * fator[0, 0]
+        else:
+            # Produto 2-D (n, k) @ (k, k): evita o matmul em lote com k pequeno
+            ruido = (ruido.reshape(-1, k) @ fator.T).reshape(sinal.shape)
+        ruido *= sigma[..., None]
+        ruido += sinal
+        return ruido
+
+    def _canal_por_nivel(self, nivel, snr_db):
+        """NRZ e AMI: estatística = média do intervalo de bit = nível + ruído."""
+        s = self.samples_per_bit
+        R = np.full((s, 1), 1.0 / s)
+        m = self._estatisticas_ruidosas(nivel[..., None], s * nivel ** 2, R, snr_db)
+        return m[..., 0]
 
-        t = np.arange(len(waveform)) / fs
-        return t, waveform
+    def _canal_nrz_polar(self, b, snr_db):
+        nivel = np.where(b == 1, self.V, -self.V)
+        return self._decide_nrz_polar(self._canal_por_nivel(nivel, snr_db))
 
-    def decode_st_qam(self, waveform):
-        samples_per_symbol = 4 * self.samples_per_bit
-        Ts = 4 * self.Tb
-        fs = self.fs
-        fc = 1 / Ts
-
-        num_symbols = len(waveform) // samples_per_symbol
-        bits = []
-
-        # Níveis da constelação (4 níveis por eixo)
-        """ 
-        índice 0: -1/√2 (level1)
-        índice 1: -1/(3√2) (level2)
-        índice 2: +1/(3√2) (level3)
-        índice 3: +1/√2 (level4)
-        """
-        sqrt2 = np.sqrt(2)
-        levels = np.array([-1 / sqrt2 * self.V, -1 / (3 * sqrt2) * self.V, 1 / (3 * sqrt2) * self.V, 1 / sqrt2 * self.V])
-
-        # Mapeamento inverso Gray
-        inverse_mapping = {
-            (1, 1): (0, 0, 0, 0),  # level2, level2
-            (1, 0): (0, 0, 0, 1),  # level2, level1
-            (1, 2): (0, 0, 1, 1),  # level2, level3
-            (1, 3): (0, 0, 1, 0),  # level2, level4
-            (0, 1): (0, 1, 0, 0),  # level1, level2
-            (0, 0): (0, 1, 0, 1),  # level1, level1
-            (0, 2): (0, 1, 1, 1),  # level1, level3
-            (0, 3): (0, 1, 1, 0),  # level1, level4
-            (2, 1): (1, 1, 0, 0),  # level3, level2
-            (2, 0): (1, 1, 0, 1),  # level3, level1
-            (2, 2): (1, 1, 1, 1),  # level3, level3
-            (2, 3): (1, 1, 1, 0),  # level3, level4
-            (3, 1): (1, 0, 0, 0),  # level4, level2
-            (3, 0): (1, 0, 0, 1),  # level4, level1
-            (3, 2): (1, 0, 1, 1),  # level4, level3
-            (3, 3): (1, 0, 1, 0),  # level4, level4
-        }
-        for i in range(num_symbols):
-            ini = i * samples_per_symbol
-            fim = ini + samples_per_symbol
-            simbolo = waveform[ini:fim]
-
-            t_local = np.arange(0, samples_per_symbol) / fs
-            I_t = np.sqrt(2 / Ts) * np.cos(2 * np.pi * fc * t_local)
-            Q_t = -np.sqrt(2 / Ts) * np.sin(2 * np.pi * fc * t_local)
+    def _canal_bipolar_ami(self, b, snr_db):
+        nivel, _ = self._niveis_ami(b, -1)
+        return self._decide_bipolar_ami(self._canal_por_nivel(nivel, snr_db))
 
-            # Correlação (extração I(t) e Q(t))
-            corr_I = np.sum(simbolo * I_t)
-            corr_Q = np.sum(simbolo * Q_t)
-            E = np.sum(I_t ** 2)
+    def _canal_manchester(self, b, snr_db):
+        s = self.samples_per_bit
+        half = s // 2
+        # Diferença entre as médias das duas metades
+        R = np.concatenate([np.full(half, 1.0 / max(half, 1)), np.full(s - half, -1.0 / (s - half))])[:, None]
+        pattern = np.where(np.arange(s) < half, self.V, -self.V)
+        sign = np.where(b == 1, 1.0, -1.0)
+        sinal = sign[..., None] * (pattern @ R)
+        energia = np.full(b.shape, s * self.V ** 2)
+        d = self._estatisticas_ruidosas(sinal, energia, R, snr_db)
+        return self._decide_manchester(d[..., 0])
+
+    def _canal_ask(self, b, snr_db):
+        s = self.samples_per_bit
+        tabela = self._tabela_ask().astype(np.float64)
+        energia = np.einsum('ij,ij->i', tabela, tabela)[b]
+        sigma = self._sigma_simbolos(energia, s, snr_db)
+        # Energia de (portadora + ruído): componente do ruído na direção da
+        # portadora (z) mais a energia no complemento ortogonal (qui-quadrado, s-1 graus)
+        z = self.ruido.unitario(b.shape, dtype=self._dtype_calculo)
+        chi2 = self.ruido.rng.chisquare(s - 1, b.shape) if s > 1 else 0.0
+        power = ((np.sqrt(energia) + sigma * z) ** 2 + sigma ** 2 * chi2) / s
+        return self._decide_ask(power)
+
+    def _canal_fsk(self, b, snr_db):
+        tabela, refs = self._tabelas_fsk()
+        tabela = tabela.astype(np.float64)
+        refs = refs.astype(np.float64)
+        sinal = (tabela @ refs)[b]
+        energia = np.einsum('ij,ij->i', tabela, tabela)[b]
+        return self._decide_fsk(self._estatisticas_ruidosas(sinal, energia, refs, snr_db))
+
+    def _canal_mfsk(self, b, snr_db, M=4):
+        bits_per_symbol = self._bits_por_simbolo(M)
+        tabela, refs = self._tabelas_mfsk(M)
+        tabela = tabela.astype(np.float64)
+        refs = refs.astype(np.float64)
+        simbolos = self._indices_de_simbolo(b, bits_per_symbol)
+        sinal = (tabela @ refs)[simbolos]
+        energia = np.einsum('ij,ij->i', tabela, tabela)[simbolos]
+        corr = self._estatisticas_ruidosas(sinal, energia, refs, snr_db)
+        return self._decide_mfsk(corr, bits_per_symbol)
+
+    def _canal_iq(self, aI, aQ, bits_per_symbol, snr_db):
+        base, E = self._base_iq(bits_per_symbol)
+        base = base.astype(np.float64)
+        G = base.T @ base
+        energia = G[0, 0] * aI ** 2 + 2 * G[0, 1] * aI * aQ + G[1, 1] * aQ ** 2
+        sinal = np.stack([aI * G[0, 0] + aQ * G[1, 0], aI * G[0, 1] + aQ * G[1, 1]], axis=-1) / E
+        proj = self._estatisticas_ruidosas(sinal, energia, base / E, snr_db)
+        return proj[..., 0], proj[..., 1]
+
+    def _canal_mpsk(self, b, snr_db, M=8):
+        aI, aQ = self._amplitudes_psk(b, M)
+        return self._decide_psk(*self._canal_iq(aI, aQ, self._bits_por_simbolo(M), snr_db), M)
+
+    def _canal_mqam(self, b, snr_db, M=16):
+        aI, aQ = self._amplitudes_qam(b, M)
+        return self._decide_qam(*self._canal_iq(aI, aQ, self._bits_por_simbolo(M), snr_db), M)
+
+    def _canal_qpsk(self, b, snr_db):
+        return self._canal_mpsk(b, snr_db, M=4)
+
+    def _canal_st_qam(self, b, snr_db):
+        return self._canal_mqam(b, snr_db, M=16)
+
+    # -------------------------
+    # Streaming (memória constante)
+    # -------------------------
+    def modula_stream(self, modulacao, blocos_bits):
+        """
+        Versão em gerador de qualquer modulador de MODULACOES.
 
-            I_hat = corr_I / E
-            Q_hat = corr_Q / E
+        Recebe um iterável de blocos de bits e produz blocos de waveform
+        (o tempo da amostra i do fluxo é i / fs). Bits que não completam um
+        símbolo ficam guardados para o próximo bloco e a alternância do AMI
+        continua entre blocos; a concatenação das saídas é igual ao resultado
+        de chamar o modulador uma vez com todos os bits.
+        """
+        modular, _, bps = self.par_modulacao(modulacao)
+        ami = modulacao == "Bipolar (AMI)"
+        last_polarity = -1
+        resto = np.zeros(0, dtype=np.uint8)
+
+        for bloco in blocos_bits:
+            b = self._bits_array(bloco)
+            if len(resto):
+                b = np.concatenate([resto, b])
+            n = len(b) // bps * bps
+            b, resto = b[:n], b[n:]
+            if n == 0:
+                continue
+            if ami:
+                w, last_polarity = self._ami(b, last_polarity)
+                last_polarity = int(last_polarity)
+            else:
+                _, w = modular(b)
+            yield w
 
-            # Quantização em 4 níveis (decisão pelo nível mais próximo)
-            I_idx = np.argmin(np.abs(I_hat - levels))
-            Q_idx = np.argmin(np.abs(Q_hat - levels))
+        # Símbolo incompleto no fim: o modulador completa com zeros
+        if len(resto):
+            _, w = modular(resto)
+            yield w
 
-            # Conversão para bits usando mapeamento inverso
-            if (I_idx, Q_idx) in inverse_mapping:
-                symbol_bits = inverse_mapping[(I_idx, Q_idx)]
-                bits.extend(symbol_bits)
+    def _demodulador(self, modulacao, iq=False):
+        """
+        (demodulador, amostras por símbolo) de `modulacao`: o de MODULACOES
+        sobre amostras reais ou, com iq=True, demodula_iq sobre o envelope.
+        Amostras complexas só entram no demodulador real se Q for todo zero
+        (waveform real gravado em complex64); senão é erro, não descarte de Q.
+        """
+        if iq:
+            bps, freqs, _, _ = self._espec_iq(modulacao)
+            n = self._tabelas_iq(bps, freqs)[2]
+            return (lambda w: self.demodula_iq(modulacao, w)), n
+
+        _, demodular, bps = self.par_modulacao(modulacao)
+
+        def demodular_real(w):
+            if np.iscomplexobj(w):
+                if np.any(w.imag):
+                    raise ValueError("amostras com parte imaginária: para envelopes I/Q use iq=True")
+                w = w.real
+            return demodular(w)
+
+        return demodular_real, bps * self.samples_per_bit
+
+    def demodula_stream(self, modulacao, blocos_waveform, iq=False):
+        """
+        Versão em gerador de qualquer demodulador de MODULACOES.
+
+        Recebe um iterável de blocos de amostras (de qualquer tamanho) e produz
+        blocos de bits. Amostras de um símbolo partido entre dois blocos são
+        guardadas até o símbolo ficar completo; a concatenação das saídas é
+        igual ao resultado do demodulador sobre o waveform inteiro.
+        Com iq=True os blocos são do envelope complexo (modula_iq) e cada
+        símbolo é decidido por demodula_iq.
+        """
+        demodular, sps = self._demodulador(modulacao, iq)
+        resto = np.zeros(0, dtype=self.dtype_iq if iq else self.dtype)
+
+        for bloco in blocos_waveform:
+            w = np.asarray(bloco)
+            saida = []
+            if len(resto):
+                falta = sps - len(resto)
+                resto = np.concatenate([resto, w[:falta]])
+                w = w[falta:]
+                if len(resto) < sps:
+                    continue
+                saida.append(demodular(resto))
+            n = len(w) // sps * sps
+            if n:
+                saida.append(demodular(w[:n]))
+            resto = w[n:].copy()
+            if not saida:
+                continue
+
+            bits = np.concatenate(saida) if len(saida) > 1 else saida[0]
+            if len(bits):
+                yield bits
+
+    # -------------------------
+    # Envelope complexo (banda base I/Q)
+    # -------------------------
+    # Toda modulação com portadora daqui é, em cada símbolo (com a fase
+    # reiniciada a cada símbolo), uma soma de tons:
+    #     s(t) = Re{ sum_k c_k exp(j 2π f_k t) }
+    # O envelope complexo em torno de f0 (centro dos tons) é
+    #     x(t) = sum_k c_k exp(j 2π (f_k - f0) t),  com s(t) = Re{x(t) exp(j 2π f0 t)}
+    # e varia devagar: basta amostrá-lo com poucas amostras por símbolo.
+    def _espec_iq(self, modulacao):
+        """
+        Retorna (bits_por_simbolo, freqs, coeficientes, decide):
+          - freqs: frequências f_k dos tons de cada símbolo (banda passante)
+          - coeficientes(b): bits -> c de cada símbolo, (..., n_simbolos, n_tons)
+          - decide(c): estimativa de c -> bits, com as mesmas decisões dos decode_*
+        """
+        metodo, _, bps, *params = self.MODULACOES[modulacao]
+        kwargs = params[0] if params else {}
+        V = self.V
+
+        if metodo == 'ask':
+            # V sen(2π fc t) = Re{-jV exp(j 2π fc t)}
+            def coeficientes(b):
+                return (-1j * V * b)[..., None]
+
+            def decide(c):
+                # Potência na banda passante = |c|² / 2
+                return self._decide_ask(np.abs(c[..., 0]) ** 2 / 2)
+
+            return bps, [self.fc], coeficientes, decide
+
+        if metodo in ('fsk', 'mfsk'):
+            if metodo == 'fsk':
+                # Tom 0 -> f1 (bit '1'), tom 1 -> f2 (bit '0'), como nas refs de decode_fsk
+                freqs = [self.f1_fsk, self.f2_fsk]
+                tom = lambda b: 1 - b.astype(np.intp)
+                decide_corr = self._decide_fsk
             else:
-                # Fallback para símbolos não mapeados
-                bits.extend([0, 0, 0, 0])
-        return bits
+                M = kwargs["M"]
+                freqs = (np.arange(M) + 1) / (bps * self.Tb)
+                tom = lambda b: self._indices_de_simbolo(b, bps)
+                decide_corr = lambda corr: self._decide_mfsk(corr, bps)
+
+            def coeficientes(b):
+                idx = tom(b)
+                c = np.zeros(idx.shape + (len(freqs),), dtype=complex)
+                np.put_along_axis(c, idx[..., None], -1j * V, axis=-1)
+                return c
+
+            def decide(c):
+                # Energia de cada tom: mesmas somas de quadrados de decode_fsk/decode_mfsk
+                corr = np.stack([c.real, c.imag], axis=-1).reshape(c.shape[:-1] + (2 * len(freqs),))
+                return decide_corr(corr)
+
+            return bps, freqs, coeficientes, decide
+
+        # PSK/QAM: aI √(2/Ts) cos - aQ √(2/Ts) sen = Re{√(2/Ts) (aI + j aQ) exp(j 2π fc t)}
+        Ts = bps * self.Tb
+        escala = np.sqrt(2 / Ts)
+        if metodo in ('qpsk', 'mpsk'):
+            M = kwargs.get("M", 4)
+            amplitudes = lambda b: self._amplitudes_psk(b, M)
+            decide_iq = lambda I, Q: self._decide_psk(I, Q, M)
+        elif metodo in ('st_qam', 'mqam'):
+            M = kwargs.get("M", 16)
+            amplitudes = lambda b: self._amplitudes_qam(b, M)
+            decide_iq = lambda I, Q: self._decide_qam(I, Q, M)
+        else:
+            raise ValueError(f"{modulacao!r} não é uma modulação com portadora")
+
+        def coeficientes(b):
+            aI, aQ = amplitudes(b)
+            return (escala * (aI + 1j * aQ))[..., None]
+
+        def decide(c):
+            return decide_iq(c[..., 0].real / escala, c[..., 0].imag / escala)
+
+        return bps, [1 / Ts], coeficientes, decide
+
+    def _tabelas_iq(self, bits_per_symbol, freqs):
+        """
+        Retorna (tons_bb, tons_pb, n):
+          - tons_bb: (n, n_tons), exp(j 2π (f_k - f0) t) nas n amostras do envelope
+          - tons_pb: (n_tons, samples_per_symbol), exp(j 2π f_k t) na banda passante
+        n = max(amostras_iq, n_tons): com tons espaçados de 1/Ts, n >= n_tons
+        amostras por símbolo bastam para que sejam ortogonais no envelope.
+        """
+        freqs = np.asarray(freqs, dtype=float)
+        n = max(self.amostras_iq, len(freqs))
+        samples_per_symbol = bits_per_symbol * self.samples_per_bit
+        Ts = bits_per_symbol * self.Tb
+
+        def gerar():
+            f0 = freqs.mean()
+            t_bb = np.arange(n) * (Ts / n)
+            t_pb = np.arange(samples_per_symbol) / self.fs
+            tons_bb = np.exp(2j * np.pi * np.multiply.outer(t_bb, freqs - f0))
+            tons_pb = np.exp(2j * np.pi * np.multiply.outer(freqs, t_pb))
+            return tons_bb, tons_pb, n
+
+        chave = ('I/Q tons', self.samples_per_bit, None, self.fs, self.Tb, (tuple(freqs), n), None)
+        return CACHE_TABELAS.obter(chave, gerar)
+
+    def _coeficientes_iq(self, envelope, bits_per_symbol, freqs):
+        """Estimativa de c de cada símbolo: projeção do envelope em cada tom."""
+        tons_bb, _, n = self._tabelas_iq(bits_per_symbol, freqs)
+        w = np.asarray(envelope)
+        n_simbolos = w.shape[-1] // n
+        blocos = w[..., :n_simbolos * n].reshape(w.shape[:-1] + (n_simbolos, n))
+        return (blocos @ tons_bb.conj()) / n
+
+    def modula_iq(self, modulacao, bits):
+        """
+        Envelope complexo (dtype_iq) da modulação com portadora `modulacao`,
+        com max(amostras_iq, n_tons) amostras por símbolo em vez de
+        samples_per_symbol amostras reais. Retorna (t, envelope).
+        """
+        bps, freqs, coeficientes, _ = self._espec_iq(modulacao)
+        tons_bb, _, n = self._tabelas_iq(bps, freqs)
+        c = coeficientes(self._bits_array(bits))
+        envelope = self._junta_blocos(c @ tons_bb.T).astype(self.dtype_iq)
+        Ts = bps * self.Tb
+        t = EixoTempo(envelope.shape[-1], n / Ts, dtype=self._dtype_calculo)
+        return t, envelope
+
+    def demodula_iq(self, modulacao, envelope):
+        """Decide os bits a partir do envelope complexo (mesmas regras dos decode_*)."""
+        bps, freqs, _, decide = self._espec_iq(modulacao)
+        return decide(self._coeficientes_iq(envelope, bps, freqs))
+
+    def add_awgn_iq(self, envelope, snr_db, modulacao):
+        """
+        Ruído complexo no envelope com a mesma densidade espectral que
+        add_awgn(waveform, snr_db) teria na banda passante, ou seja, o mesmo
+        ruído nas estatísticas de decisão. Para PSK, QAM e FSK a BER é a
+        mesma do caminho por amostras. O ASK decide pela energia; na banda
+        passante essa energia inclui o ruído fora da banda do sinal, então
+        o envelope (que só tem a banda útil) erra menos.
+        """
+        bps, freqs, _, _ = self._espec_iq(modulacao)
+        _, _, n = self._tabelas_iq(bps, freqs)
+        # SNR por amostra do envelope = SNR por amostra real * sps / (2 n)
+        ajuste_db = 10 * np.log10(bps * self.samples_per_bit / (2 * n))
+        return self.add_awgn(envelope, np.asarray(snr_db, dtype=float) + ajuste_db)
+
+    def para_banda_passante(self, modulacao, envelope):
+        """
+        Converte o envelope para a banda passante (para plotar ou exportar):
+        retorna (t, waveform) real a fs, igual ao do modulador da banda
+        passante para um envelope sem ruído.
+        """
+        bps, freqs, _, _ = self._espec_iq(modulacao)
+        _, tons_pb, _ = self._tabelas_iq(bps, freqs)
+        c = self._coeficientes_iq(envelope, bps, freqs)
+        waveform = self._junta_blocos((c @ tons_pb).real).astype(self.dtype)
+        t = self._eixo_tempo(waveform)
+        return t, waveform
+
+    # -------------------------
+    # Decodificação paralela (threads)
+    # -------------------------
+    def decodifica_paralelo(self, modulacao, waveform, n_threads=None, simbolos_bloco=None, iq=False):
+        """
+        Decodifica `waveform` (1-D, lote 2-D ou memmap) com o demodulador de
+        `modulacao`, dividido em blocos alinhados a símbolos e distribuídos
+        num pool de `n_threads` threads (padrão: os.cpu_count()). As contas
+        do NumPy liberam o GIL, então os blocos rodam em paralelo de fato.
+        Os bits são remontados em ordem e são idênticos aos do demodulador
+        serial, já que cada símbolo é decidido de forma independente.
+
+        simbolos_bloco: símbolos por bloco (padrão: ~4 blocos por thread,
+        com no mínimo 4096 símbolos).
+        iq: `waveform` é o envelope complexo (modula_iq), decidido por demodula_iq.
+        """
+        demodular, sps = self._demodulador(modulacao, iq)
+        n_threads = int(n_threads or os.cpu_count() or 1)
+        n_simbolos = np.shape(waveform)[-1] // sps
+        if simbolos_bloco is None:
+            simbolos_bloco = max(4096, -(-n_simbolos // (4 * n_threads)))
+        passo = int(simbolos_bloco) * sps
+
+        # O último bloco leva as amostras que sobram (símbolo incompleto),
+        # descartadas pelo demodulador como no caso serial
+        inicios = list(range(0, max(n_simbolos, 1) * sps, passo))
+        fins = inicios[1:] + [np.shape(waveform)[-1]]
+        if n_threads == 1 or len(inicios) == 1:
+            return demodular(waveform)
+
+        with ThreadPoolExecutor(max_workers=n_threads) as pool:
+            partes = list(pool.map(lambda ini, fim: demodular(waveform[..., ini:fim]), inicios, fins))
+        return np.concatenate(partes, axis=-1)
+
+    # -------------------------
+    # Capturas em disco (memmap)
+    # -------------------------
+    def grava_captura(self, caminho, waveform, formato=None):
+        """
+        Grava um waveform (ou um gerador de blocos, como modula_stream) em
+        disco: float32 bruto, complex64 I/Q intercalado (layout do File Sink
+        do GNU Radio) ou .npy. O formato vem da extensão se não for dado
+        (ver Captura.EXTENSOES). Retorna o número de amostras gravadas.
+        """
+        return grava_captura(caminho, waveform, formato)
+
+    def le_captura(self, caminho, formato=None):
+        """Captura como np.memmap somente leitura (nada é carregado na RAM)."""
+        return abre_captura(caminho, formato)
+
+    def blocos_captura(self, caminho, amostras_bloco=1 << 20, formato=None):
+        """Lê uma captura 1-D em blocos de `amostras_bloco` amostras (no dtype do arquivo)."""
+        captura = abre_captura(caminho, formato).reshape(-1)
+        for ini in range(0, len(captura), int(amostras_bloco)):
+            yield captura[ini:ini + int(amostras_bloco)]
+
+    def decodifica_captura(self, modulacao, caminho, amostras_bloco=1 << 20, formato=None,
+                           n_threads=None, iq=False):
+        """
+        Decodifica offline uma captura com o demodulador de `modulacao`,
+        lendo o arquivo em blocos (memória limitada a ~amostras_bloco amostras
+        além dos bits de saída). Capturas .npy 2-D (lotes) são decodificadas
+        por grupos de linhas e retornam uma matriz de bits.
+        Com n_threads > 1 os blocos são decodificados em paralelo
+        (decodifica_paralelo), com ~n_threads blocos na memória ao mesmo tempo.
+
+        iq=True: a captura é um envelope complexo gravado de modula_iq,
+        decidido por demodula_iq. Sem iq, capturas complexas só valem com
+        Q = 0 (waveform real gravado em complex64); com Q ≠ 0 é ValueError.
+        """
+        captura = abre_captura(caminho, formato)
+        if iq and not np.iscomplexobj(captura):
+            raise ValueError(f"iq=True precisa de uma captura complexa, não {captura.dtype}")
+        demodular, sps = self._demodulador(modulacao, iq)
+        if n_threads is not None and n_threads > 1:
+            return self.decodifica_paralelo(modulacao, captura, n_threads,
+                                            simbolos_bloco=max(1, int(amostras_bloco) // sps), iq=iq)
+        if captura.ndim == 2:
+            linhas = max(1, int(amostras_bloco) // max(captura.shape[1], 1))
+            saida = [demodular(captura[i:i + linhas]) for i in range(0, len(captura), linhas)]
+            return np.concatenate(saida) if saida else np.zeros((0, 0), dtype=np.uint8)
+
+        saida = list(self.demodula_stream(modulacao, self.blocos_captura(caminho, amostras_bloco, formato), iq))
+        return np.concatenate(saida) if saida else np.zeros(0, dtype=np.uint8)
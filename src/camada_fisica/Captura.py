@@ -0,0 +1,110 @@
+import os
+
+import numpy as np
+
+
+# Extensão -> formato. Os formatos brutos seguem o layout do File Sink do
+# GNU Radio: amostras float32 (ou I/Q complex64 intercalados) sem cabeçalho.
+EXTENSOES = {
+    ".npy": "npy",
+    ".f32": "float32", ".bin": "float32", ".raw": "float32",
+    ".cf32": "complex64", ".fc32": "complex64", ".c64": "complex64", ".cfile": "complex64",
+}
+FORMATOS = ("float32", "complex64", "npy")
+
+
+def formato_captura(caminho, formato=None):
+    """Formato explícito ou deduzido da extensão (float32 se desconhecida)."""
+    if formato is None:
+        formato = EXTENSOES.get(os.path.splitext(str(caminho))[1].lower(), "float32")
+    if formato not in FORMATOS:
+        raise ValueError(f"formato deve ser um de {FORMATOS}, não {formato!r}")
+    return formato
+
+
+def _blocos(dados):
+    """Um array (ou lista) vira um único bloco; outros iteráveis são percorridos como estão."""
+    if isinstance(dados, (np.ndarray, list, tuple)):
+        return [np.asarray(dados)]
+    return dados
+
+
+def _checa_real(bloco, dtype):
+    """Amostras complexas num formato real perderiam Q sem aviso (só ComplexWarning)."""
+    if np.iscomplexobj(bloco) and dtype.kind != "c":
+        raise ValueError(f"amostras complexas não cabem no formato {dtype.name}: use complex64")
+
+
+def grava_captura(caminho, dados, formato=None):
+    """
+    Grava amostras em disco.
+
+    dados: array (1-D, ou 2-D para um lote) ou gerador de blocos 1-D (ex.:
+    a saída de CamadaFisica.modula_stream), que é gravado bloco a bloco sem
+    juntar tudo na memória.
+      - float32: amostras reais brutas (lotes são gravados linha após linha);
+        dados complexos são ValueError (use complex64 para envelopes I/Q)
+      - complex64: I/Q intercalados; amostras reais entram com Q = 0
+      - npy: array .npy com o dtype e o formato originais
+    Retorna o número de amostras gravadas.
+    """
+    formato = formato_captura(caminho, formato)
+    if formato == "npy":
+        return _grava_npy(caminho, dados)
+
+    dtype = np.dtype(formato)
+    total = 0
+    with open(caminho, "wb") as f:
+        for bloco in _blocos(dados):
+            bloco = np.asarray(bloco)
+            _checa_real(bloco, dtype)
+            np.ascontiguousarray(bloco, dtype=dtype).tofile(f)
+            total += bloco.size
+    return total
+
+
+def _grava_npy(caminho, dados):
+    if isinstance(dados, (np.ndarray, list, tuple)):
+        dados = np.asarray(dados)
+        np.save(caminho, dados)
+        return dados.size
+
+    # Tamanho desconhecido: grava os blocos num arquivo bruto temporário e
+    # depois copia, em partes, para um .npy mapeado em memória
+    temporario = str(caminho) + ".parcial"
+    dtype = None
+    try:
+        with open(temporario, "wb") as f:
+            for bloco in dados:
+                bloco = np.asarray(bloco)
+                dtype = bloco.dtype if dtype is None else dtype
+                _checa_real(bloco, dtype)
+                np.ascontiguousarray(bloco, dtype=dtype).tofile(f)
+        dtype = dtype if dtype is not None else np.dtype(np.float32)
+        n = os.path.getsize(temporario) // dtype.itemsize
+        destino = np.lib.format.open_memmap(caminho, mode="w+", dtype=dtype, shape=(n,))
+        if n:
+            origem = np.memmap(temporario, dtype=dtype, mode="r", shape=(n,))
+            passo = 1 << 22
+            for ini in range(0, n, passo):
+                destino[ini:ini + passo] = origem[ini:ini + passo]
+            del origem
+        destino.flush()
+        del destino
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+    return n
+
+
+def abre_captura(caminho, formato=None):
+    """
+    Abre uma captura sem carregá-la: retorna um np.memmap somente leitura
+    (float32 ou complex64 para arquivos brutos, o dtype original para .npy).
+    """
+    formato = formato_captura(caminho, formato)
+    if formato == "npy":
+        return np.load(caminho, mmap_mode="r")
+    if os.path.getsize(caminho) == 0:
+        return np.zeros(0, dtype=formato)
+    return np.memmap(caminho, dtype=formato, mode="r")
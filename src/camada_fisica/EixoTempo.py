@@ -0,0 +1,156 @@
+# src/camada_fisica/EixoTempo.py
+import numbers
+
+import numpy as np
+
+
+class EixoTempo(np.lib.mixins.NDArrayOperatorsMixin):
+    """
+    Eixo de tempo "preguiçoso" de um waveform amostrado a fs.
+
+    Guarda só (inicio, fs, comprimento): o valor da posição i é
+        inicio + (primeiro + i * passo) / fs
+    (primeiro/passo são índices de amostra, usados quando o eixo é fatiado).
+    Se comporta como um array 1-D ao ser indexado, fatiado, convertido com
+    np.asarray ou passado ao matplotlib, mas só materializa os valores
+    quando alguém realmente precisa deles.
+
+    Somar, subtrair, multiplicar e dividir por escalares, negar e fatiar
+    continuam preguiçosos; qualquer outra operação (ufuncs, comparações,
+    t ** 2, 1 / t, métodos de ndarray como t.astype ou t.mean) materializa
+    o eixo e é feita pelo numpy, com o mesmo resultado de um ndarray.
+    """
+
+    def __init__(self, comprimento, fs, inicio=0.0, dtype=np.float64, primeiro=0, passo=1):
+        self.comprimento = int(comprimento)
+        self.fs = fs
+        self.inicio = inicio
+        self.dtype = np.dtype(dtype)
+        self.primeiro = int(primeiro)
+        self.passo = int(passo)
+
+    # --- Interface de array ---
+    @property
+    def shape(self):
+        return (self.comprimento,)
+
+    @property
+    def ndim(self):
+        return 1
+
+    @property
+    def size(self):
+        return self.comprimento
+
+    @property
+    def nbytes(self):
+        """Bytes que o eixo ocuparia se fosse materializado."""
+        return self.comprimento * self.dtype.itemsize
+
+    def __len__(self):
+        return self.comprimento
+
+    def materializar(self, dtype=None):
+        """Gera o array numpy com todos os instantes."""
+        idx = np.arange(self.primeiro, self.primeiro + self.comprimento * self.passo, self.passo)
+        t = idx / self.fs
+        if self.inicio:
+            t = self.inicio + t
+        return t.astype(dtype if dtype is not None else self.dtype, copy=False)
+
+    def __array__(self, dtype=None, copy=None):
+        return self.materializar(dtype)
+
+    def __array_ufunc__(self, ufunc, method, *entradas, **kwargs):
+        entradas = tuple(e.materializar() if isinstance(e, EixoTempo) else e for e in entradas)
+        return getattr(ufunc, method)(*entradas, **kwargs)
+
+    def __getattr__(self, nome):
+        # Demais métodos e atributos de ndarray (astype, mean, tolist, ...)
+        if nome.startswith("_"):
+            raise AttributeError(nome)
+        return getattr(self.materializar(), nome)
+
+    def astype(self, dtype, copy=True):
+        return self.materializar(dtype).copy() if copy else self.materializar(dtype)
+
+    def min(self, *args, **kwargs):
+        if args or kwargs or not self.comprimento:
+            return self.materializar().min(*args, **kwargs)
+        # Valores em progressão aritmética: o mínimo está numa das pontas
+        return min(self[0], self[-1])
+
+    def max(self, *args, **kwargs):
+        if args or kwargs or not self.comprimento:
+            return self.materializar().max(*args, **kwargs)
+        return max(self[0], self[-1])
+
+    def __iter__(self):
+        for i in range(self.comprimento):
+            yield self[i]
+
+    def __getitem__(self, chave):
+        if isinstance(chave, numbers.Integral):
+            i = int(chave)
+            if i < 0:
+                i += self.comprimento
+            if not 0 <= i < self.comprimento:
+                raise IndexError("índice fora do eixo de tempo")
+            valor = (self.primeiro + i * self.passo) / self.fs
+            return self.dtype.type(self.inicio + valor if self.inicio else valor)
+
+        if isinstance(chave, slice):
+            ini, fim, passo = chave.indices(self.comprimento)
+            if passo > 0:
+                # Fatia simples continua preguiçosa
+                return EixoTempo(len(range(ini, fim, passo)), self.fs, self.inicio, self.dtype,
+                                 self.primeiro + ini * self.passo, self.passo * passo)
+
+        # Passo negativo, máscaras, listas de índices...: materializa
+        return self.materializar()[chave]
+
+    # --- Aritmética com escalares (mantém o eixo preguiçoso) ---
+    def _escala(self, k):
+        # t * k = inicio * k + idx / (fs / k)
+        return EixoTempo(self.comprimento, self.fs / k, self.inicio * k, self.dtype,
+                         self.primeiro, self.passo)
+
+    def __add__(self, outro):
+        if isinstance(outro, numbers.Real):
+            return EixoTempo(self.comprimento, self.fs, self.inicio + outro, self.dtype,
+                             self.primeiro, self.passo)
+        return self.materializar() + outro
+
+    __radd__ = __add__
+
+    def __sub__(self, outro):
+        if isinstance(outro, numbers.Real):
+            return self + (-outro)
+        return self.materializar() - outro
+
+    def __rsub__(self, outro):
+        if isinstance(outro, numbers.Real):
+            return -self + outro
+        return outro - self.materializar()
+
+    def __neg__(self):
+        return self._escala(-1)
+
+    def __pos__(self):
+        return self
+
+    def __mul__(self, outro):
+        if isinstance(outro, numbers.Real) and outro != 0:
+            return self._escala(outro)
+        return self.materializar() * outro
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, outro):
+        if isinstance(outro, numbers.Real) and outro != 0:
+            return self._escala(1 / outro)
+        return self.materializar() / outro
+
+    def __repr__(self):
+        return (f"EixoTempo(comprimento={self.comprimento}, fs={self.fs}, inicio={self.inicio}, "
+                f"dtype={self.dtype.name})")
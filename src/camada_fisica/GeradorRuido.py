@@ -0,0 +1,51 @@
+# src/camada_fisica/GeradorRuido.py
+import numpy as np
+
+
+class GeradorRuido:
+    """
+    Fonte de ruído gaussiano de variância unitária da camada física,
+    construída sobre numpy.random.Generator.
+
+      - seed: inteiro, SeedSequence ou None (entropia do sistema). Com a
+        mesma semente o ruído é sempre o mesmo.
+      - spawn(n): n geradores independentes (um por worker paralelo).
+      - criar_pool(n): pré-gera n amostras; enquanto o pool existir, pedidos
+        que cabem nele devolvem uma janela (em posição aleatória) do pool em
+        vez de sortear amostras novas. Útil em varreduras, onde o custo de
+        gerar ruído domina.
+    """
+
+    def __init__(self, seed=None):
+        if isinstance(seed, np.random.SeedSequence):
+            self.seed_seq = seed
+        else:
+            self.seed_seq = np.random.SeedSequence(seed)
+        self.rng = np.random.Generator(np.random.PCG64(self.seed_seq))
+        self._pool = None
+
+    def spawn(self, n):
+        """Cria n geradores com fluxos estatisticamente independentes deste."""
+        return [GeradorRuido(s) for s in self.seed_seq.spawn(n)]
+
+    def criar_pool(self, n_amostras, dtype=np.float64):
+        """Pré-gera um pool de n_amostras de ruído unitário (somente leitura)."""
+        self._pool = self.rng.standard_normal(int(n_amostras), dtype=dtype)
+        self._pool.setflags(write=False)
+
+    def descartar_pool(self):
+        self._pool = None
+
+    def unitario(self, shape, dtype=np.float64):
+        """
+        Ruído N(0, 1) com o formato pedido. Vem do pool quando possível;
+        nesse caso o array é uma view somente leitura (ou uma cópia, se o
+        dtype do pool for diferente do pedido).
+        """
+        shape = tuple(np.atleast_1d(shape)) if not isinstance(shape, tuple) else shape
+        n = int(np.prod(shape))
+        pool = self._pool
+        if pool is not None and n <= len(pool):
+            ini = int(self.rng.integers(0, len(pool) - n + 1))
+            return pool[ini:ini + n].reshape(shape).astype(dtype, copy=False)
+        return self.rng.standard_normal(shape, dtype=dtype)
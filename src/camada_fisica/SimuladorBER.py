@@ -0,0 +1,138 @@
+# src/camada_fisica/SimuladorBER.py
+from statistics import NormalDist
+
+import numpy as np
+
+from camada_fisica.CamadaFisica import CamadaFisica
+
+
+def intervalo_wilson(erros, total, confianca=0.95):
+    """
+    Intervalo de confiança de Wilson para uma taxa de erro erros/total.
+    Retorna (inferior, superior). Com total == 0 retorna (0, 1).
+    """
+    if total == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + confianca / 2)
+    p = erros / total
+    den = 1 + z ** 2 / total
+    centro = (p + z ** 2 / (2 * total)) / den
+    meia = z * np.sqrt(p * (1 - p) / total + z ** 2 / (4 * total ** 2)) / den
+    return max(0.0, centro - meia), min(1.0, centro + meia)
+
+
+class SimuladorBER:
+    """
+    Mede BER/SER x SNR para qualquer modulação de CamadaFisica.
+
+    Bits aleatórios são gerados em blocos (matriz n_quadros x bits_por_quadro)
+    e passam pelo par modulador/demodulador já existente, com o ruído de
+    add_awgn (ou, com nivel="simbolo", pelo modo rápido canal_simbolos, que
+    tem a mesma estatística sem gerar amostras). Cada ponto de SNR para assim que:
+      - atingir `erros_alvo` erros de bit, ou
+      - a meia-largura do intervalo de confiança ficar abaixo de
+        `precisao_relativa` * BER (se informada), ou
+      - `max_bits` bits tiverem sido simulados.
+    O tamanho do bloco começa pequeno (pontos de SNR baixo terminam em poucos
+    milissegundos) e cresce conforme a estimativa de quantos bits ainda faltam.
+    """
+
+    def __init__(self, camada=None, bits_por_quadro=1024, max_amostras_bloco=2 ** 22, seed=None,
+                 nivel="amostra"):
+        """
+        camada: instância de CamadaFisica (padrão: CamadaFisica())
+        bits_por_quadro: bits por linha do lote (arredondado para múltiplo de 4 e,
+                         em cada ponto, para múltiplo dos bits por símbolo)
+        max_amostras_bloco: limite de amostras por bloco (controla a memória)
+        seed: semente dos bits aleatórios (e do ruído, se `camada` não for dada)
+        nivel: "amostra" (modula, add_awgn, demodula), "simbolo"
+               (CamadaFisica.canal_simbolos, sem gerar o waveform) ou "iq"
+               (envelope complexo: modula_iq, add_awgn_iq, demodula_iq; só
+               para modulações com portadora)
+        """
+        if nivel not in ("amostra", "simbolo", "iq"):
+            raise ValueError(f"nivel deve ser 'amostra', 'simbolo' ou 'iq', não {nivel!r}")
+        self.nivel = nivel
+        seed_bits, seed_ruido = np.random.SeedSequence(seed).spawn(2)
+        self.camada = camada if camada is not None else CamadaFisica(seed=seed_ruido)
+        self.bits_por_quadro = max(4, int(bits_por_quadro) // 4 * 4)
+        self.max_amostras_bloco = int(max_amostras_bloco)
+        self.rng = np.random.default_rng(seed_bits)
+
+    def _max_quadros_bloco(self):
+        por_bit = {"simbolo": 1, "iq": self.camada.amostras_iq}.get(self.nivel, self.camada.samples_per_bit)
+        amostras_quadro = self.bits_por_quadro * por_bit
+        return max(1, self.max_amostras_bloco // amostras_quadro)
+
+    def ponto(self, modulacao, snr_db, erros_alvo=100, precisao_relativa=None,
+              confianca=0.95, max_bits=10 ** 7):
+        """Simula um único ponto de SNR. Retorna um dict com as contagens e as taxas."""
+        modular, demodular, bps = self.camada.par_modulacao(modulacao)
+        n = max(bps, self.bits_por_quadro // bps * bps)
+        max_quadros = self._max_quadros_bloco()
+
+        bits = erros = simbolos = erros_simb = 0
+        quadros = 1
+        while bits < max_bits:
+            b = self.rng.integers(0, 2, (quadros, n), dtype=np.uint8)
+            if self.nivel == "simbolo":
+                rx = self.camada.canal_simbolos(modulacao, b, snr_db)[:, :n]
+            elif self.nivel == "iq":
+                _, x = self.camada.modula_iq(modulacao, b)
+                rx = self.camada.demodula_iq(modulacao, self.camada.add_awgn_iq(x, snr_db, modulacao))[:, :n]
+            else:
+                _, w = modular(b)
+                rx = demodular(self.camada.add_awgn(w, snr_db))[:, :n]
+
+            diff = rx != b
+            erros += int(diff.sum())
+            erros_simb += int(diff.reshape(quadros, n // bps, bps).any(axis=-1).sum())
+            bits += b.size
+            simbolos += b.size // bps
+
+            if erros >= erros_alvo:
+                break
+            if precisao_relativa is not None and erros > 0:
+                inf, sup = intervalo_wilson(erros, bits, confianca)
+                if (sup - inf) / 2 <= precisao_relativa * (erros / bits):
+                    break
+
+            # Próximo bloco: dobra, ou vai direto ao número estimado de bits que falta
+            restante = max_bits - bits
+            if erros > 0:
+                restante = min(restante, int((erros_alvo - erros) * bits / erros) + 1)
+            quadros = int(min(max_quadros, max(1, min(2 * quadros, -(-restante // n)))))
+
+        ber_inf, ber_sup = intervalo_wilson(erros, bits, confianca)
+        ser_inf, ser_sup = intervalo_wilson(erros_simb, simbolos, confianca)
+        return {
+            "snr_db": float(snr_db),
+            "bits": bits, "erros": erros,
+            "simbolos": simbolos, "erros_simbolo": erros_simb,
+            "ber": erros / bits if bits else 0.0, "ber_inf": ber_inf, "ber_sup": ber_sup,
+            "ser": erros_simb / simbolos if simbolos else 0.0, "ser_inf": ser_inf, "ser_sup": ser_sup,
+        }
+
+    def curva(self, modulacao, snrs_db, erros_alvo=100, precisao_relativa=None,
+              confianca=0.95, max_bits=10 ** 7, parar_sem_erros=True):
+        """
+        Simula a curva BER/SER para a grade `snrs_db`.
+
+        Se parar_sem_erros=True, ao encontrar um ponto sem nenhum erro em
+        max_bits os SNRs seguintes (assumidos em ordem crescente) não são
+        simulados: recebem BER = 0 e herdam o limite superior desse ponto.
+
+        Retorna um dict de arrays numpy (uma posição por SNR) com as chaves
+        snr_db, bits, erros, simbolos, erros_simbolo, ber, ber_inf, ber_sup,
+        ser, ser_inf, ser_sup.
+        """
+        pontos = []
+        for snr in snrs_db:
+            if parar_sem_erros and pontos and pontos[-1]["erros"] == 0:
+                anterior = pontos[-1]
+                pontos.append(dict(anterior, snr_db=float(snr), bits=0, simbolos=0))
+                continue
+            pontos.append(self.ponto(modulacao, snr, erros_alvo, precisao_relativa,
+                                     confianca, max_bits))
+
+        return {k: np.array([p[k] for p in pontos]) for k in pontos[0]} if pontos else {}
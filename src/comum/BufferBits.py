@@ -0,0 +1,153 @@
+import numpy as np
+
+
+# -------------------------
+# Conversões (bits como array np.uint8, um bit por elemento, MSB primeiro)
+# -------------------------
+def como_bits(bits):
+    """
+    Converte bits (lista de 0/1, array, BufferBits) para array np.uint8.
+    bytes/bytearray/memoryview são tomados como bits empacotados (MSB primeiro).
+    Arrays 2-D (lotes) são mantidos; qualquer outro formato vira 1-D.
+    Se a entrada já for um array uint8, não há cópia.
+    """
+    if isinstance(bits, (bytes, bytearray, memoryview)):
+        return np.unpackbits(np.frombuffer(bits, dtype=np.uint8))
+    b = np.asarray(bits)
+    if b.dtype != np.uint8:
+        b = b.astype(np.uint8)
+    if b.ndim != 2:
+        b = b.reshape(-1)
+    return b
+
+
+def bits_de_bytes(dados):
+    """bytes (ou lista de inteiros 0..255) -> array de bits (MSB primeiro)."""
+    if isinstance(dados, (bytes, bytearray, memoryview)):
+        dados = np.frombuffer(dados, dtype=np.uint8)
+    return np.unpackbits(np.asarray(dados, dtype=np.uint8).reshape(-1))
+
+
+def bytes_de_bits(bits):
+    """
+    Array de bits -> array np.uint8 de bytes (MSB primeiro).
+    Bits que não completam o último byte são completados com zeros.
+    Entradas já empacotadas (bytes, BufferBits) não são desempacotadas.
+    """
+    if isinstance(bits, (bytes, bytearray, memoryview)):
+        return np.frombuffer(bits, dtype=np.uint8).copy()
+    if isinstance(bits, BufferBits):
+        return bits.empacotados()
+    return np.packbits(como_bits(bits), axis=-1)
+
+
+def como_quadro(quadro):
+    """
+    Quadro empacotado: bytes/bytearray/memoryview e BufferBits viram
+    BufferBits sem desempacotar; bits (lista, array) são empacotados.
+    """
+    if isinstance(quadro, BufferBits):
+        return quadro
+    if isinstance(quadro, (bytes, bytearray, memoryview)):
+        return BufferBits(quadro)
+    return BufferBits.de_bits(quadro)
+
+
+def como_bytes(dados):
+    """bytes, bytearray, memoryview ou array/lista de inteiros 0..255 -> bytes."""
+    if isinstance(dados, bytes):
+        return dados
+    if isinstance(dados, (bytearray, memoryview)):
+        return bytes(dados)
+    return np.asarray(dados, dtype=np.uint8).tobytes()
+
+
+def texto_para_bits(s: str):
+    return bits_de_bytes(s.encode("utf-8"))
+
+
+def bits_para_texto(bits):
+    return bytes_de_bits(bits).tobytes().decode("utf-8", errors="replace")
+
+
+class BufferBits:
+    """
+    Sequência de bits guardada empacotada (8 bits por byte, MSB primeiro):
+    1/8 de byte por bit, contra 1 byte por bit de um array np.uint8 e 8 bytes
+    por bit de uma lista.
+
+    Funciona como array onde um array é esperado (np.asarray devolve os bits
+    desempacotados), então pode ser passado direto para as camadas.
+    """
+
+    def __init__(self, dados=b"", n_bits=None):
+        """
+        dados: bytes já empacotados
+        n_bits: número de bits válidos (padrão: 8 * len(dados))
+        """
+        self.dados = np.frombuffer(bytes(dados), dtype=np.uint8)
+        self.n_bits = 8 * len(self.dados) if n_bits is None else int(n_bits)
+        if not 0 <= self.n_bits <= 8 * len(self.dados):
+            raise ValueError(f"n_bits fora do intervalo: {self.n_bits}")
+
+    @classmethod
+    def de_bits(cls, bits):
+        b = como_bits(bits).reshape(-1)
+        return cls(np.packbits(b).tobytes(), len(b))
+
+    @classmethod
+    def de_texto(cls, s: str):
+        return cls(s.encode("utf-8"))
+
+    def __len__(self):
+        return self.n_bits
+
+    def __getitem__(self, idx):
+        """Bit (int) ou fatia de bits (array np.uint8); fatias contíguas só desempacotam os bytes envolvidos."""
+        if isinstance(idx, slice):
+            ini, fim, passo = idx.indices(self.n_bits)
+            if passo == 1:
+                fim = max(fim, ini)
+                b0 = ini // 8
+                b = np.unpackbits(self.dados[b0:(fim + 7) // 8])
+                return b[ini - 8 * b0:fim - 8 * b0]
+            return self.bits()[idx]
+        i = range(self.n_bits)[idx]
+        return int(self.dados[i // 8] >> (7 - i % 8)) & 1
+
+    def __array__(self, dtype=None, copy=None):
+        b = np.unpackbits(self.dados, count=self.n_bits)
+        return b if dtype is None else b.astype(dtype, copy=False)
+
+    def bits(self):
+        """Bits desempacotados (array np.uint8)."""
+        return np.asarray(self)
+
+    def tobytes(self):
+        return self.dados.tobytes()
+
+    def empacotados(self):
+        """Os bytes (np.uint8) que contêm os n_bits, com os bits de sobra do último zerados."""
+        n, resto = divmod(self.n_bits, 8)
+        if resto == 0:
+            return self.dados[:n].copy()
+        b = self.dados[:n + 1].copy()
+        b[-1] &= (0xFF << (8 - resto)) & 0xFF
+        return b
+
+    def quadro(self):
+        """bytes quando os bits completam bytes inteiros; senão o próprio BufferBits."""
+        if self.n_bits % 8 == 0:
+            return self.dados[:self.n_bits // 8].tobytes()
+        return self
+
+    def texto(self):
+        return bits_para_texto(self.bits())
+
+    def __eq__(self, outro):
+        if not isinstance(outro, BufferBits):
+            return NotImplemented
+        return self.n_bits == outro.n_bits and np.array_equal(self.bits(), outro.bits())
+
+    def __repr__(self):
+        return f"BufferBits(n_bits={self.n_bits})"
@@ -12,6 +12,7 @@ from matplotlib.figure import Figure
 from matplotlib.backends.backend_gtk3agg import FigureCanvasGTK3Agg as FigureCanvas
 import numpy as np
 from camada_enlace.CamadaEnlace import CamadaEnlace
+from comum.BufferBits import texto_para_bits, bytes_de_bits
 
 
 # ============================================================
@@ -104,6 +105,7 @@ class InterfaceGUI(Gtk.Window):
         self.combo_det = Gtk.ComboBoxText()
         self.combo_det.append_text("Paridade Par")
         self.combo_det.append_text("Checksum")
+        self.combo_det.append_text("Checksum-16")
         self.combo_det.append_text("CRC-32")
         self.combo_det.set_active(0)
         grid.attach(self.combo_det, 1, 4, 3, 1)
@@ -187,19 +189,20 @@ class InterfaceGUI(Gtk.Window):
         self.ax_tx.cla()
         self.ax_rx.cla()
 
+        # t pode ser um EixoTempo (preguiçoso): materializa só para o gráfico
         if t_tx is not None and s_tx is not None:
-            self.ax_tx.plot(t_tx, s_tx)
+            self.ax_tx.plot(np.asarray(t_tx), s_tx)
             self.ax_tx.grid(True)
 
         if t_rx is not None and s_rx is not None:
-            self.ax_rx.plot(t_rx, s_rx)
+            self.ax_rx.plot(np.asarray(t_rx), s_rx)
             self.ax_rx.grid(True)
 
         self.canvas.draw_idle()
 
-        if bits_tx:
+        if bits_tx is not None and len(bits_tx):
             self.lbl_bits_tx.set_text(f"Bits TX: {''.join(map(str,bits_tx[:64]))}...")
-        if bits_rx:
+        if bits_rx is not None and len(bits_rx):
             self.lbl_bits_rx.set_text(f"Bits RX: {''.join(map(str,bits_rx[:64]))}...")
 
         self.lbl_received.set_text("Recebido: " + text_rx)
@@ -269,10 +272,7 @@ class InterfaceGUI_Hamming(Gtk.Window):
         text = self.entry.get_text()
 
         # texto → bits
-        bits = []
-        for c in text.encode():
-            for i in range(8):
-                bits.append((c >> (7-i)) & 1)
+        bits = texto_para_bits(text)
 
         self.out1.set_text("Bits originais: " + ''.join(map(str,bits[:64])) + "...")
 
@@ -286,15 +286,8 @@ class InterfaceGUI_Hamming(Gtk.Window):
         dec = self.enlace.hamming_decode(err)
         self.out4.set_text("Decodificado: " + ''.join(map(str,dec[:64])) + "...")
 
-        # bits → texto
-        text_out = ""
-        for i in range(0,len(dec),8):
-            byte = dec[i:i+8]
-            if len(byte)==8:
-                val=0
-                for b in byte:
-                    val = (val<<1)|b
-                text_out += chr(val)
+        # bits → texto (só bytes completos)
+        text_out = "".join(map(chr, bytes_de_bits(dec[:len(dec) // 8 * 8]).tolist()))
 
         self.out5.set_text("Texto final: " + text_out)
 
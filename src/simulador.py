@@ -1,7 +1,7 @@
 import sys
 from pathlib import Path
 
-from camada_enlace.CamadaEnlace import CamadaEnlace
+from camada_enlace.CamadaEnlaceBytes import CamadaEnlaceBytes
 
 ROOT = Path(__file__).resolve().parent
 sys.path.insert(0, str(ROOT / "camada_fisica"))
@@ -11,33 +11,17 @@ sys.path.insert(0, str(ROOT / "camada_enlace"))
 from gui.MainWindow import MainWindow
 from gui.InterfaceGUI import InterfaceGUI, InterfaceGUI_Hamming
 from camada_fisica.CamadaFisica import CamadaFisica
+from comum.BufferBits import bits_para_texto, como_bits, como_quadro
 
-import numpy as np
 from gi.repository import Gtk
 
 
 # ----------------------------
 # Utilidades
 # ----------------------------
-def text_to_bits(s: str):
-    b = s.encode("utf-8")
-    bits = []
-    for byte in b:
-        for i in range(8):
-            bits.append((byte >> (7 - i)) & 1)
-    return bits
-
 def bits_to_text(bits):
-    pad = (-len(bits)) % 8
-    bits = bits + [0] * pad
-    out = bytearray()
-    for i in range(0, len(bits), 8):
-        byte = 0
-        for j in range(8):
-            byte = (byte << 1) | bits[i + j]
-        out.append(byte)
     try:
-        return out.decode("utf-8", errors="replace")
+        return bits_para_texto(bits)
     except:
         return "<decode error>"
 
@@ -67,10 +51,11 @@ def run_exercicio_111(menu_window):
         apply_hamming = params.get("apply_hamming", False)
 
         cf = CamadaFisica(samples_per_bit=spb, V=V)
-        enlace = CamadaEnlace()
+        # Enlace trabalha com bytes; bits só na fronteira com a camada física
+        enlace = CamadaEnlaceBytes()
 
-        # Texto → bits
-        bits_tx = text_to_bits(text)
+        # Texto → bytes
+        bits_tx = text.encode("utf-8")
 
         # Se Hamming estiver ativado → aplica antes de tudo
         if apply_hamming:
@@ -95,9 +80,14 @@ def run_exercicio_111(menu_window):
                 bits_com_deteccao = enlace.encode_paridade(bits_para_transmitir)
             elif error_detection == "Checksum":
                 bits_com_deteccao = enlace.encode_checksum(bits_para_transmitir)
+            elif error_detection == "Checksum-16":
+                bits_com_deteccao = enlace.encode_checksum16(bits_para_transmitir)
             elif error_detection == "CRC-32":
                 bits_com_deteccao = enlace.encode_crc(bits_para_transmitir)
 
+        # Quadro → bits (única conversão na transmissão)
+        bits_com_deteccao = como_bits(bits_com_deteccao)
+
         # Modulação
         if modulation == "NRZ-Polar":
             t_tx, s_tx = cf.nrz_polar(bits_com_deteccao)
@@ -116,21 +106,26 @@ def run_exercicio_111(menu_window):
         elif modulation == "Bipolar (AMI)":
             bits_rx_encoded = cf.decode_bipolar_ami(s_rx)
 
+        # Bits → quadro (única conversão na recepção)
+        quadro_rx = como_quadro(bits_rx_encoded)
+
         # Se tiver Hamming → decodifica AGORA
         if apply_hamming:
-            bits_corrigidos = enlace.hamming_decode(bits_rx_encoded)
+            bits_corrigidos = enlace.hamming_decode(quadro_rx)
             erro_detectado = False
         else:
             # Detecção de erro normal
-            bits_corrigidos = bits_rx_encoded
+            bits_corrigidos = quadro_rx
             erro_detectado = False
 
             if error_detection == "Paridade Par":
-                bits_corrigidos, erro_detectado = enlace.decode_paridade(bits_rx_encoded)
+                bits_corrigidos, erro_detectado = enlace.decode_paridade(quadro_rx)
             elif error_detection == "Checksum":
-                bits_corrigidos, erro_detectado = enlace.decode_checksum(bits_rx_encoded)
+                bits_corrigidos, erro_detectado = enlace.decode_checksum(quadro_rx)
+            elif error_detection == "Checksum-16":
+                bits_corrigidos, erro_detectado = enlace.decode_checksum16(quadro_rx)
             elif error_detection == "CRC-32":
-                bits_corrigidos, erro_detectado = enlace.decode_crc(bits_rx_encoded)
+                bits_corrigidos, erro_detectado = enlace.decode_crc(quadro_rx)
 
         # 8. Desenquadramento
         bits_final = bits_corrigidos
@@ -144,7 +139,7 @@ def run_exercicio_111(menu_window):
                 bits_final = enlace.desenquadramento_flag_bits(bits_corrigidos)
         except:
             erro_detectado = True
-            bits_final = []
+            bits_final = b""
 
         # Se tinha Hamming → já está corrigido
         text_rx = bits_to_text(bits_final)
@@ -152,7 +147,7 @@ def run_exercicio_111(menu_window):
         return {
             "t_tx": t_tx, "s_tx": s_tx,
             "t_rx": t_tx, "s_rx": s_rx,
-            "bits_tx": bits_para_transmitir,
+            "bits_tx": como_quadro(bits_para_transmitir),
             "bits_rx": bits_rx_encoded,
             "text_rx": text_rx,
             "erro": erro_detectado
@@ -190,9 +185,10 @@ def run_exercicio_112(menu_window):
         apply_hamming = params.get("apply_hamming", False)
 
         cf = CamadaFisica(samples_per_bit=spb, V=V)
-        enlace = CamadaEnlace()
+        # Enlace trabalha com bytes; bits só na fronteira com a camada física
+        enlace = CamadaEnlaceBytes()
 
-        bits_tx = text_to_bits(text)
+        bits_tx = text.encode("utf-8")
 
         if apply_hamming:
             bits_tx = enlace.hamming_encode(bits_tx)
@@ -213,24 +209,24 @@ def run_exercicio_112(menu_window):
                 bits_com_deteccao = enlace.encode_paridade(bits_para_transmitir)
             elif error_detection == "Checksum":
                 bits_com_deteccao = enlace.encode_checksum(bits_para_transmitir)
+            elif error_detection == "Checksum-16":
+                bits_com_deteccao = enlace.encode_checksum16(bits_para_transmitir)
             elif error_detection == "CRC-32":
                 bits_com_deteccao = enlace.encode_crc(bits_para_transmitir)
 
+        # Quadro → bits (única conversão na transmissão)
+        bits_com_deteccao = como_bits(bits_com_deteccao)
+
         # Modulação
         if modulation == "ASK":
             t_tx, s_tx = cf.ask(bits_com_deteccao)
         elif modulation == "FSK":
             t_tx, s_tx = cf.fsk(bits_com_deteccao)
         elif modulation == "QPSK":
-            aux = bits_com_deteccao.copy()
-            if len(aux) % 2 != 0:
-                aux.append(0)
-            t_tx, s_tx = cf.qpsk(aux)
+            # O modulador completa o último símbolo com zeros
+            t_tx, s_tx = cf.qpsk(bits_com_deteccao)
         elif modulation == "16-QAM":
-            aux = bits_com_deteccao.copy()
-            pad = (4 - len(aux) % 4) % 4
-            aux += [0] * pad
-            t_tx, s_tx = cf.st_qam(aux)
+            t_tx, s_tx = cf.st_qam(bits_com_deteccao)
 
         s_rx = cf.add_awgn(s_tx, snr_db) if snr_db > 0 else s_tx
 
@@ -245,19 +241,24 @@ def run_exercicio_112(menu_window):
             tmp = cf.decode_st_qam(s_rx)
             bits_rx_encoded = tmp[:len(bits_com_deteccao)]
 
+        # Bits → quadro (única conversão na recepção)
+        quadro_rx = como_quadro(bits_rx_encoded)
+
         if apply_hamming:
-            bits_corrigidos = enlace.hamming_decode(bits_rx_encoded)
+            bits_corrigidos = enlace.hamming_decode(quadro_rx)
             erro_detectado = False
         else:
-            bits_corrigidos = bits_rx_encoded
+            bits_corrigidos = quadro_rx
             erro_detectado = False
 
             if error_detection == "Paridade Par":
-                bits_corrigidos, erro_detectado = enlace.decode_paridade(bits_rx_encoded)
+                bits_corrigidos, erro_detectado = enlace.decode_paridade(quadro_rx)
             elif error_detection == "Checksum":
-                bits_corrigidos, erro_detectado = enlace.decode_checksum(bits_rx_encoded)
+                bits_corrigidos, erro_detectado = enlace.decode_checksum(quadro_rx)
+            elif error_detection == "Checksum-16":
+                bits_corrigidos, erro_detectado = enlace.decode_checksum16(quadro_rx)
             elif error_detection == "CRC-32":
-                bits_corrigidos, erro_detectado = enlace.decode_crc(bits_rx_encoded)
+                bits_corrigidos, erro_detectado = enlace.decode_crc(quadro_rx)
 
         bits_final = bits_corrigidos
         try:
@@ -269,14 +270,14 @@ def run_exercicio_112(menu_window):
                 bits_final = enlace.desenquadramento_flag_bits(bits_corrigidos)
         except:
             erro_detectado = True
-            bits_final = []
+            bits_final = b""
 
         text_rx = bits_to_text(bits_final)
 
         return {
             "t_tx": t_tx, "s_tx": s_tx,
             "t_rx": t_tx, "s_rx": s_rx,
-            "bits_tx": bits_para_transmitir,
+            "bits_tx": como_quadro(bits_para_transmitir),
             "bits_rx": bits_rx_encoded,
             "text_rx": text_rx,
             "erro": erro_detectado